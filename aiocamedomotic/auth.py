@@ -26,27 +26,128 @@ Note:
 """
 
 
+import asyncio
 import functools
 import json
+import random
 import time
-from typing import Optional
-from asyncio import Lock
+from types import MappingProxyType
+from typing import Final, Optional
+from urllib.parse import quote_plus
 import aiohttp
+from aiohttp import hdrs
+from multidict import CIMultiDict
+from yarl import URL
 
 from cryptography.fernet import Fernet
 
 from .const import LOGGER
 from .errors import (
+    CameDomoticError,
     CameDomoticAuthError,
     CameDomoticServerError,
     CameDomoticServerNotFoundError,
 )
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+
+def json_dumps(obj) -> str:
+    """Serialize an object to a compact JSON string.
+
+    Uses ``orjson`` when available, falling back to the standard ``json`` module. The
+    fallback uses the same compact separators and, like ``orjson``, leaves non-ASCII
+    characters unescaped, so that both produce the same string.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()  # pylint: disable=no-member
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def json_loads(data: bytes | str):
+    """Deserialize a JSON document, using ``orjson`` when available.
+
+    Raises:
+        json.JSONDecodeError: if the document is not valid JSON (the ``orjson``
+            exception is a subclass of it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)  # pylint: disable=no-member
+    return json.loads(data)
+
+
+# Messages of the known ACK error codes of the login response
+_LOGIN_ACK_ERROR_MESSAGES: Final = MappingProxyType({1: "Bad credentials."})
+
+# Retries of a request whose connection dropped, and their backoff parameters
+_CONNECTION_RETRIES = 2
+_CONNECTION_RETRY_BASE_DELAY_SEC = 0.1
+_CONNECTION_RETRY_JITTER_SEC = 0.05
+
+
+def encode_command_form(command: str) -> bytes:
+    """Encode a JSON command as the ``command=...`` form body expected by the server.
+
+    The body has a single field, so it is built directly as bytes: aiohttp sends it
+    as it is, instead of going through its generic form encoding on every request.
+
+    Args:
+        command (str): the JSON-encoded command.
+
+    Returns:
+        bytes: the URL-encoded form body.
+    """
+    return b"command=" + quote_plus(command, safe="").encode("ascii")
+
+
+def _get_command_name(command: str) -> Optional[str]:
+    """Get the name of a JSON-encoded command, to refer to it in the logs.
+
+    Only the name is extracted: the whole command may carry the credentials.
+    """
+    try:
+        payload = json_loads(command)
+    except json.JSONDecodeError:
+        return None
+    return (payload.get("sl_appl_msg") or {}).get("cmd_name") or payload.get("sl_cmd")
+
+
+# Envelope shared by all the "sl_data_req" commands, filled in with
+# (client ID, command name, cseq, extra members, client ID)
+_DATA_REQ_TEMPLATE = (
+    '{"sl_appl_msg":{"client":"%s","cmd_name":"%s","cseq":%d%s},'
+    '"sl_appl_msg_type":"domo","sl_client_id":"%s","sl_cmd":"sl_data_req"}'
+)
+
+
+def build_data_req(client_id: str, cmd_name: str, cseq: int, extra: str = "") -> str:
+    """Render a JSON-encoded ``sl_data_req`` command, without building any dict.
+
+    Args:
+        client_id (str): the client ID of the session.
+        cmd_name (str): the name of the command (e.g. "light_list_req").
+        cseq (int): the command sequence number.
+        extra (str, optional): additional members of the application message, already
+            JSON-encoded and each one preceded by a comma (e.g. ``',"act_id":1'``).
+
+    Returns:
+        str: the JSON-encoded command.
+    """
+    return _DATA_REQ_TEMPLATE % (client_id, cmd_name, cseq, extra, client_id)
+
 
 def handle_came_domotic_errors(func):
     """Decorator to handle CAME Domotic API errors.
 
-    The decorator catches the following exceptions:
+    Exceptions that are already ``CameDomoticError`` instances are re-raised as they
+    are, while the decorator logs and converts the following exceptions:
+    - aiohttp.ServerDisconnectedError, aiohttp.ClientOSError: for dropped
+      connections, retried up to ``_CONNECTION_RETRIES`` times (with exponential
+      backoff and jitter) before giving up, unless the connection could not be
+      established at all
     - aiohttp.ClientResponseError: for HTTP errors (4xx, 5xx)
     - aiohttp.ServerTimeoutError: for timeouts
     - aiohttp.ClientError: for other network-related errors
@@ -59,28 +160,52 @@ def handle_came_domotic_errors(func):
     @functools.wraps(func)
     async def wrapper(*args, **kwargs):
         """Wrapper function for the decorator."""
-        try:
-            return await func(*args, **kwargs)
-        except aiohttp.ClientResponseError as e:
-            # Specific HTTP errors
-            raise CameDomoticServerError(
-                f"HTTP POST resulted in an HTTP {e.status} error ({e.message})"
-            ) from e
-        except aiohttp.ServerTimeoutError as e:
-            # Handle timeouts specifically
-            raise CameDomoticServerError(
-                f"HTTP POST resulted in a timeout error ({e})"
-            ) from e
-        except aiohttp.ClientError as e:
-            # General network-related errors
-            raise CameDomoticServerError(
-                f"HTTP POST resulted in an unexpected network error ({e})'"
-            ) from e
-        except Exception as e:
-            # Catch-all for any other unforeseen errors
-            raise CameDomoticServerError(
-                "Generic error in communication with CAME Domotic API."
-            ) from e
+        for attempt in range(_CONNECTION_RETRIES + 1):
+            try:
+                return await func(*args, **kwargs)
+            except CameDomoticError:
+                # Already a library error (e.g. bad ACK), don't wrap it again
+                raise
+            except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError) as e:
+                # Transient connection drops (e.g. a pooled keep-alive connection
+                # closed by the server): retry, rather than forcing the caller to
+                # start over with a new login. Failing to connect at all
+                # (ClientConnectorError) is not worth retrying.
+                if attempt == _CONNECTION_RETRIES or isinstance(
+                    e, aiohttp.ClientConnectorError
+                ):
+                    LOGGER.error("Connection error in '%s': %s", func.__name__, e)
+                    raise CameDomoticServerError(
+                        f"HTTP POST resulted in a connection error ({e})"
+                    ) from e
+                await asyncio.sleep(
+                    _CONNECTION_RETRY_BASE_DELAY_SEC * 2**attempt
+                    + random.random() * _CONNECTION_RETRY_JITTER_SEC
+                )
+            except aiohttp.ClientResponseError as e:
+                # Specific HTTP errors
+                LOGGER.error("HTTP error in '%s': %s", func.__name__, e)
+                raise CameDomoticServerError(
+                    f"HTTP POST resulted in an HTTP {e.status} error ({e.message})"
+                ) from e
+            except aiohttp.ServerTimeoutError as e:
+                # Handle timeouts specifically
+                LOGGER.error("Timeout in '%s': %s", func.__name__, e)
+                raise CameDomoticServerError(
+                    f"HTTP POST resulted in a timeout error ({e})"
+                ) from e
+            except aiohttp.ClientError as e:
+                # General network-related errors
+                LOGGER.error("Network error in '%s': %s", func.__name__, e)
+                raise CameDomoticServerError(
+                    f"HTTP POST resulted in an unexpected network error ({e})'"
+                ) from e
+            except Exception as e:
+                # Catch-all for any other unforeseen errors
+                LOGGER.exception("Unexpected error in '%s': %s", func.__name__, e)
+                raise CameDomoticServerError(
+                    "Generic error in communication with CAME Domotic API."
+                ) from e
 
     return wrapper
 
@@ -94,12 +219,38 @@ class Auth:
         ``async_create``.
     """
 
+    # Fixed set of attributes: no per-instance __dict__, smaller and faster to access.
+    # __weakref__ keeps the instances weak-referenceable.
+    __slots__ = (
+        "cipher_suite",
+        "username",
+        "password",
+        "host",
+        "_endpoint_url",
+        "websession",
+        "close_websession_on_disposal",
+        "session_expiration_timestamp",
+        "client_id",
+        "keep_alive_timeout_sec",
+        "cseq",
+        "_lock",
+        "__weakref__",
+    )
+
     # Default timeout "safe zone" for session expiration
     _DEFAULT_SAFE_ZONE_SEC = 30
-    _DEFAULT_HTTP_HEADERS = {
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Connection": "Keep-Alive",
-    }
+    # Default timeout of the HTTP requests, built once as the ClientTimeout object
+    # aiohttp would otherwise create on every request
+    _DEFAULT_TIMEOUT_SEC = 10
+    _DEFAULT_CLIENT_TIMEOUT = aiohttp.ClientTimeout(total=_DEFAULT_TIMEOUT_SEC)
+    # Built once as a case-insensitive multidict with istr keys, the type aiohttp uses
+    # internally, so the keys don't have to be normalized again on every request.
+    # No "Connection: Keep-Alive" header: it's already the HTTP/1.1 default used by
+    # aiohttp, the connection reuse is configured on the connector instead (see
+    # create_websession).
+    _DEFAULT_HTTP_HEADERS = CIMultiDict(
+        {hdrs.CONTENT_TYPE: "application/x-www-form-urlencoded"}
+    )
 
     # Factory method to create an Auth instance
     @classmethod
@@ -111,6 +262,7 @@ class Auth:
         password: str,
         *,
         close_websession_on_disposal: bool = True,
+        validate_host: bool = True,
     ):
         """Create an Auth instance.
 
@@ -121,10 +273,14 @@ class Auth:
             password (str): the password to use for the authentication.
             close_websession_on_disposal (bool, optional): whether to close the
                 websession when disposing the Auth instance (default: True).
+            validate_host (bool, optional): whether to probe the host with an HTTP
+                request before returning (default: True). When False, no request is
+                made here and the first command doubles as host validation.
 
         Raises:
             CameDomoticServerNotFoundError: if the host doesn't respond to an HTTP
-                request or doesn't expose the CAME Domotic API endopoint.
+                request or doesn't expose the CAME Domotic API endopoint (only when
+                ``validate_host`` is True).
 
         Returns:
             Auth: the Auth instance.
@@ -133,17 +289,47 @@ class Auth:
             The session is not logged in until the first request is made.
         """
 
-        auth = cls(
-            websession,
-            host,
-            username,
-            password,
-            close_websession_on_disposal=close_websession_on_disposal,
+        # The instance is built in a worker thread, so that the encryption of the
+        # credentials doesn't block the event loop
+        auth = await asyncio.to_thread(
+            functools.partial(
+                cls,
+                websession,
+                host,
+                username,
+                password,
+                close_websession_on_disposal=close_websession_on_disposal,
+            )
         )
-        await auth.async_validate_host()
+        if validate_host:
+            await auth.async_validate_host()
 
         return auth
 
+    @staticmethod
+    def create_websession() -> aiohttp.ClientSession:
+        """Create an aiohttp client session tuned for the CAME Domotic server.
+
+        The session talks to a single host that is polled repeatedly, so it uses a
+        small connection pool whose connections are kept alive between two requests,
+        instead of opening a new TCP connection for each command. The host name
+        (if any) is resolved once every few minutes rather than every few seconds.
+
+        Returns:
+            ClientSession: the aiohttp client session.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=10,
+            limit_per_host=4,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+            force_close=False,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=Auth._DEFAULT_HTTP_HEADERS,
+        )
+
     @staticmethod
     def create_cypher_suite() -> Fernet:
         """Create a cypher suite."""
@@ -180,22 +366,23 @@ class Auth:
         # in clear text in the memory of the running process; also, this at least ensure
         # that the credentials cannot be written in the logs even by mistake.
         self.cipher_suite = Auth.create_cypher_suite()
-        self.username = self.cipher_suite.encrypt(username.encode())
-        self.password = self.cipher_suite.encrypt(password.encode())
+        self.username, self.password = self._encrypt_credentials(username, password)
 
         self.host = host
+        # Parsed on first use, see get_endpoint_url
+        self._endpoint_url: Optional[URL] = None
         self.websession = websession
         self.close_websession_on_disposal = close_websession_on_disposal
 
         self.session_expiration_timestamp = (
-            time.monotonic() - 3600
+            Auth._now() - 3600
         )  # Set to an old timestamp to force login
 
         self.client_id = ""
         self.keep_alive_timeout_sec = 0
         self.cseq = 0
 
-        self._lock = Lock()
+        self._lock = asyncio.Lock()
 
     # region Context manager
 
@@ -207,14 +394,27 @@ class Auth:
 
     # endregion
 
-    def get_endpoint_url(self) -> str:
+    def get_endpoint_url(self) -> URL:
         """Get the CAME Domotic endpoint URL.
 
+        The URL is parsed once and then reused: aiohttp doesn't need to parse it
+        again on every request when it's a yarl URL.
+
         Returns:
-            str: the endpoint URL.
+            URL: the endpoint URL.
+
+        Raises:
+            CameDomoticServerNotFoundError: if the host is not a valid URL host.
         """
 
-        return f"http://{self.host}/domo/"
+        if self._endpoint_url is None:
+            try:
+                self._endpoint_url = URL(f"http://{self.host}/domo/")
+            except ValueError as e:
+                raise CameDomoticServerNotFoundError(
+                    f"Invalid CAME Domotic host '{self.host}' ({e})"
+                ) from e
+        return self._endpoint_url
 
     @staticmethod
     def get_http_headers() -> dict:
@@ -239,10 +439,34 @@ class Auth:
             CameDomoticAuthError: if an error occurs during the login.
         """
 
-        if not self.validate_session():
-            await self.async_login()
+        # Fast path: a valid session doesn't need to go through the lock
+        if self.validate_session():
+            return self.client_id
+
+        async with self._lock:
+            # Check again, another task may have logged in while we were waiting
+            if not self.validate_session():
+                await self._async_perform_login()
         return self.client_id
 
+    def reserve_cseq(self, count: int = 1) -> int:
+        """Reserve a block of command sequence numbers.
+
+        The counter is advanced right away, so that the commands sent concurrently
+        (even by other tasks) never get the same sequence number. This is the only
+        place where the counter is advanced, so consecutive commands get consecutive
+        sequence numbers.
+
+        Args:
+            count (int, optional): how many sequence numbers to reserve (default: 1).
+
+        Returns:
+            int: the first of the reserved sequence numbers.
+        """
+        first = self.cseq + 1
+        self.cseq += count
+        return first
+
     @handle_came_domotic_errors
     async def async_send_command(
         self,
@@ -250,7 +474,7 @@ class Auth:
         *,
         timeout: Optional[int] = 10,
         skip_ack_check: bool = False,
-    ) -> aiohttp.ClientResponse:
+    ) -> aiohttp.ClientResponse | dict:
         """Send a command to the CAME Domotic server.
 
         Args:
@@ -260,42 +484,77 @@ class Auth:
                 False).
 
         Returns:
-            ClientResponse: the response.
+            dict | ClientResponse: the JSON-decoded response body, already parsed by
+                the ACK check; the raw response if ``skip_ack_check`` is True.
 
         Raises:
             CameDomoticServerError: if an error occurs during the command.
         """
 
-        try:
-            response = await self.websession.post(
-                self.get_endpoint_url(),
-                data={"command": json.dumps(payload)},
-                headers=Auth._DEFAULT_HTTP_HEADERS,
-                timeout=timeout,
-            )
+        return await self.async_send_raw(
+            json_dumps(payload),
+            timeout=timeout,
+            skip_ack_check=skip_ack_check,
+        )
 
-            # Check if the response HTTP status is 2xx
-            if 200 <= response.status < 300:
-                # Increment the command sequence number
-                self.cseq += 1
-                # Refresh the session expiration timestamp, keeping a "safe zone"
-                self.session_expiration_timestamp = time.monotonic() + max(
-                    0, self.keep_alive_timeout_sec - Auth._DEFAULT_SAFE_ZONE_SEC
-                )
+    @handle_came_domotic_errors
+    async def async_send_raw(
+        self,
+        command: str,
+        *,
+        timeout: Optional[int] = 10,
+        skip_ack_check: bool = False,
+    ) -> aiohttp.ClientResponse | dict:
+        """Send an already JSON-encoded command to the CAME Domotic server.
 
-            if not skip_ack_check:
-                await self.async_raise_for_status_and_ack(response)
+        This is the low-level counterpart of ``async_send_command``, meant for hot
+        commands whose payload is rendered from a pre-serialized template, so that
+        no dict has to be built and encoded on every request.
+
+        Args:
+            command (str): the JSON-encoded command to send.
+            timeout (int, optional): the timeout in seconds (default: 10s).
+            skip_ack_check (bool, optional): whether to skip the ACK check (default:
+                False).
 
-            return response
+        Returns:
+            dict | ClientResponse: the JSON-decoded response body, already parsed by
+                the ACK check; the raw response if ``skip_ack_check`` is True.
 
+        Raises:
+            CameDomoticServerError: if an error occurs during the command.
+        """
+
+        response = await self.websession.post(
+            self.get_endpoint_url(),
+            data=encode_command_form(command),
+            headers=Auth._DEFAULT_HTTP_HEADERS,
+            timeout=Auth._get_client_timeout(timeout),
+        )
+
+        # Check if the response HTTP status is 2xx
+        is_success = 200 <= response.status < 300
+        if is_success:
+            # Refresh the session expiration timestamp, keeping a "safe zone"
+            self.session_expiration_timestamp = Auth._now() + max(
+                0, self.keep_alive_timeout_sec - Auth._DEFAULT_SAFE_ZONE_SEC
+            )
+
+        try:
+            if not skip_ack_check:
+                # The body is parsed once, for the ACK check, and handed to the caller
+                if is_success:
+                    # The status is already known to be fine, only the ACK is left
+                    return Auth._check_ack(await Auth._async_read_json(response))
+                return await self.async_raise_for_status_and_ack(response)
         except CameDomoticServerError as e:
-            cmd_name = (payload.get("sl_appl_msg") or {}).get("cmd_name")
-            LOGGER.error("Error sending command '%s': %s", cmd_name, e)
-            raise e
-        except Exception as e:
-            cmd_name = (payload.get("sl_appl_msg") or {}).get("cmd_name")
-            LOGGER.exception("Error sending command '%s': %s", cmd_name, e)
-            raise CameDomoticServerError("Error sending command") from e
+            # Bad HTTP status or ACK code reported by the server
+            LOGGER.error(
+                "Error sending command '%s': %s", _get_command_name(command), e
+            )
+            raise
+
+        return response
 
     # The following method is not async because it is used in the __init__ method
     async def async_validate_host(self, timeout: Optional[int] = 10) -> None:
@@ -310,7 +569,9 @@ class Auth:
         """
         endpoint_url = self.get_endpoint_url()
         try:
-            async with self.websession.get(endpoint_url, timeout=timeout) as resp:
+            async with self.websession.get(
+                endpoint_url, timeout=Auth._get_client_timeout(timeout)
+            ) as resp:
                 # Ensure that the server URL is available
                 resp.raise_for_status()
                 if resp.status != 200:
@@ -341,54 +602,17 @@ class Auth:
     async def async_login(self) -> None:
         """Login to the CAME Domotic server.
 
+        If the current session is still valid, it's just kept alive.
+
         Raises:
             CameDomoticAuthError: if an error occurs during the login.
+            CameDomoticServerError: if an error occurs during the keep-alive request.
         """
         async with self._lock:
-            try:
-                if self.validate_session():
-                    await self.async_keep_alive()
-                else:
-                    payload = {
-                        "sl_cmd": "sl_registration_req",
-                        "sl_login": self.cipher_suite.decrypt(self.username).decode(),
-                        "sl_pwd": self.cipher_suite.decrypt(self.password).decode(),
-                    }
-
-                    # skip_ack_check = True so that a bad ACK code is tracked as an
-                    # authentication error and not as a generic server error
-                    response = await self.async_send_command(
-                        payload, skip_ack_check=True
-                    )
-                    data = await response.json(content_type=None)
-
-                    # Validate the response ACK code
-                    ack_reason = data.get("sl_data_ack_reason")
-                    if ack_reason and ack_reason == 1:
-                        raise CameDomoticAuthError("Bad credentials.")
-                    elif ack_reason and ack_reason != 0:
-                        raise CameDomoticAuthError(
-                            f"Authentication failed (ACK error: {ack_reason})"
-                        )
-
-                    # ACK is ok, store the login data
-                    self.client_id = data.get("sl_client_id")
-                    self.keep_alive_timeout_sec = data.get("sl_keep_alive_timeout_sec")
-                    self.session_expiration_timestamp = time.monotonic() + max(
-                        0, self.keep_alive_timeout_sec - Auth._DEFAULT_SAFE_ZONE_SEC
-                    )
-            except CameDomoticAuthError as e:
-                raise e
-            except json.JSONDecodeError as e:
-                raise CameDomoticAuthError(
-                    "Bad login response (JSON decoding failed)"
-                ) from e
-            except aiohttp.ClientResponseError as e:
-                raise CameDomoticAuthError(
-                    f"Login failed due to HTTP {e.status} error ({e.message})"
-                ) from e
-            except Exception as e:
-                raise CameDomoticAuthError("Unexpected error logging in") from e
+            if self.validate_session():
+                await self._async_perform_keep_alive()
+            else:
+                await self._async_perform_login()
 
     async def async_keep_alive(self) -> None:
         """Keep the session alive, eventually logging in again if needed.
@@ -398,14 +622,78 @@ class Auth:
             CameDomoticAuthError: if an error occurs during the login.
         """
         async with self._lock:
-            if not self.validate_session():
-                await self.async_login()
+            if self.validate_session():
+                await self._async_perform_keep_alive()
             else:
-                payload = {
-                    "sl_client_id": self.client_id,
-                    "sl_cmd": "sl_keep_alive_req",
-                }
-                await self.async_send_command(payload)
+                await self._async_perform_login()
+
+    async def _async_perform_login(self) -> None:
+        """Send the login request to the CAME Domotic server.
+
+        Note:
+            The caller is expected to hold the lock of the instance.
+
+        Raises:
+            CameDomoticAuthError: if an error occurs during the login.
+        """
+        try:
+            username, password = await self._async_get_credentials()
+            payload = {
+                "sl_cmd": "sl_registration_req",
+                "sl_login": username,
+                "sl_pwd": password,
+            }
+
+            # skip_ack_check = True so that a bad ACK code is tracked as an
+            # authentication error and not as a generic server error
+            response = await self.async_send_command(payload, skip_ack_check=True)
+            data = json_loads(await response.read())
+
+            # Validate the response ACK code (0 or missing means success)
+            ack_reason = data.get("sl_data_ack_reason")
+            if ack_reason:
+                message = _LOGIN_ACK_ERROR_MESSAGES.get(ack_reason)
+                raise CameDomoticAuthError(
+                    message
+                    if message is not None
+                    else f"Authentication failed (ACK error: {ack_reason})"
+                )
+
+            # ACK is ok, store the login data
+            self.client_id = data.get("sl_client_id")
+            self.keep_alive_timeout_sec = data.get("sl_keep_alive_timeout_sec")
+            self.session_expiration_timestamp = Auth._now() + max(
+                0, self.keep_alive_timeout_sec - Auth._DEFAULT_SAFE_ZONE_SEC
+            )
+        except CameDomoticAuthError as e:
+            raise e
+        except json.JSONDecodeError as e:
+            raise CameDomoticAuthError(
+                "Bad login response (JSON decoding failed)"
+            ) from e
+        except aiohttp.ClientResponseError as e:
+            raise CameDomoticAuthError(
+                f"Login failed due to HTTP {e.status} error ({e.message})"
+            ) from e
+        except Exception as e:
+            raise CameDomoticAuthError("Unexpected error logging in") from e
+
+    async def _async_perform_keep_alive(self) -> None:
+        """Send the keep-alive request to the CAME Domotic server.
+
+        Note:
+            The caller is expected to hold the lock of the instance.
+
+        Raises:
+            CameDomoticServerError: if an error occurs during the keep-alive request.
+        """
+        payload = {
+            "sl_client_id": self.client_id,
+            "sl_cmd": "sl_keep_alive_req",
+        }
+        # The body is still read, for the ACK check: the server reports an expired
+        # or unknown client ID with a bad ACK code, not with an HTTP error
+        await self.async_send_command(payload)
 
     @handle_came_domotic_errors
     async def async_logout(self) -> None:
@@ -425,7 +713,7 @@ class Auth:
             await self.async_send_command(payload)
 
             self.client_id = ""
-            self.session_expiration_timestamp = time.monotonic()
+            self.session_expiration_timestamp = Auth._now()
 
     async def async_dispose(self):
         """Dispose the Auth instance, eventually logging out if needed."""
@@ -439,26 +727,84 @@ class Auth:
 
     # region Utilities
 
+    @staticmethod
+    def _get_client_timeout(timeout: Optional[int]) -> aiohttp.ClientTimeout:
+        """Get the aiohttp timeout for a request, reusing the default one if possible.
+
+        Args:
+            timeout (int, optional): the timeout in seconds (None means no timeout).
+
+        Returns:
+            ClientTimeout: the aiohttp timeout.
+        """
+        if timeout == Auth._DEFAULT_TIMEOUT_SEC:
+            return Auth._DEFAULT_CLIENT_TIMEOUT
+        return aiohttp.ClientTimeout(total=timeout)
+
+    # Clock of the session expiration timestamps. time.monotonic() works the same
+    # inside and outside of the event loop (__init__ runs in a worker thread), and
+    # it is bound directly, so that reading it costs a single C call.
+    _now = staticmethod(time.monotonic)
+
     def validate_session(self) -> bool:
         """Check whether the session is still valid or not."""
         # Notice that self.session_expiration_timestamp already include the safe zone
         # set with the private constant _DEFAULT_SAFE_ZONE_SEC
+        return self.session_expiration_timestamp > Auth._now() and self.client_id != ""
+
+    async def _async_get_credentials(self) -> tuple[str, str]:
+        """Get the decrypted credentials.
+
+        The decryption runs in a worker thread, to avoid blocking the event loop. The
+        result is not cached, so that the credentials are in clear text only for the
+        duration of a login.
+
+        Returns:
+            tuple[str, str]: username and password.
+        """
+        return await asyncio.to_thread(self._decrypt_credentials)
+
+    def _encrypt_credentials(self, username: str, password: str) -> tuple[bytes, bytes]:
+        """Encrypt the credentials with the cipher suite of the instance."""
+        return (
+            self.cipher_suite.encrypt(username.encode()),
+            self.cipher_suite.encrypt(password.encode()),
+        )
+
+    def _decrypt_credentials(self) -> tuple[str, str]:
+        """Decrypt the credentials with the cipher suite of the instance."""
         return (
-            self.session_expiration_timestamp > time.monotonic()
-            and self.client_id != ""
+            self.cipher_suite.decrypt(self.username).decode(),
+            self.cipher_suite.decrypt(self.password).decode(),
         )
 
     @staticmethod
-    async def async_raise_for_status_and_ack(response: aiohttp.ClientResponse):
+    async def async_raise_for_status_and_ack(response: aiohttp.ClientResponse) -> dict:
         """Check the response status and raise an error if necessary.
 
         Args:
             response (ClientResponse): the response.
 
+        Returns:
+            dict: the JSON-decoded response body.
+
         Raises:
             CameDomoticServerError: if there is an error interacting with
                 the remote CAME Domotic server.
         """
+        Auth._check_status(response)
+        return Auth._check_ack(await Auth._async_read_json(response))
+
+    @staticmethod
+    def _check_status(response: aiohttp.ClientResponse) -> None:
+        """Raise an error if the response has an HTTP error status.
+
+        Args:
+            response (ClientResponse): the response.
+
+        Raises:
+            CameDomoticServerError: if the HTTP status is an error (4xx, 5xx).
+        """
         try:
             response.raise_for_status()
         except Exception as e:
@@ -466,16 +812,44 @@ class Auth:
                 f"Exception raised for HTTP status: {response.status}"
             ) from e
 
+    @staticmethod
+    async def _async_read_json(response: aiohttp.ClientResponse) -> dict:
+        """Read the response body and decode it from JSON.
+
+        Args:
+            response (ClientResponse): the response.
+
+        Returns:
+            dict: the JSON-decoded response body.
+
+        Raises:
+            CameDomoticServerError: if the body is not valid JSON.
+        """
         try:
-            resp_json = await response.json(content_type=None)
+            return json_loads(await response.read())
         except json.JSONDecodeError as e:
             raise CameDomoticServerError("Error decoding the response to JSON") from e
 
+    @staticmethod
+    def _check_ack(resp_json: dict) -> dict:
+        """Raise an error if the response body reports a bad ACK code.
+
+        Args:
+            resp_json (dict): the JSON-decoded response body.
+
+        Returns:
+            dict: the same response body, for chaining.
+
+        Raises:
+            CameDomoticServerError: if the ACK code is not 0.
+        """
         ack_reason = resp_json.get("sl_data_ack_reason")
 
-        if ack_reason and ack_reason != 0:
+        if ack_reason:
             raise CameDomoticServerError(f"Bad ack code ({ack_reason})")
 
+        return resp_json
+
     def backup_auth_credentials(self):
         """Backup the current authentication credentials."""
         return (
@@ -509,11 +883,31 @@ class Auth:
             username (str): New username.
             password (str): New password.
         """
-        self.username = self.cipher_suite.encrypt(username.encode())
-        self.password = self.cipher_suite.encrypt(password.encode())
+        self._set_encrypted_credentials(*self._encrypt_credentials(username, password))
+
+    async def async_update_auth_credentials(self, username, password):
+        """Update the authentication credentials, encrypting them in a worker thread.
+
+        Args:
+            username (str): New username.
+            password (str): New password.
+        """
+        self._set_encrypted_credentials(
+            *await asyncio.to_thread(self._encrypt_credentials, username, password)
+        )
+
+    def _set_encrypted_credentials(self, username: bytes, password: bytes):
+        """Store the (already encrypted) credentials, invalidating the session.
+
+        Args:
+            username (bytes): New encrypted username.
+            password (bytes): New encrypted password.
+        """
+        self.username = username
+        self.password = password
 
         # Invalidate the (previous) session, since the credentials have changed
-        self.session_expiration_timestamp = time.monotonic() - 3600
+        self.session_expiration_timestamp = Auth._now() - 3600
         self.client_id = ""
 
     # endregion
@@ -16,27 +16,47 @@
 This module exposes the CAME Domotic API to the end-users.
 """
 
-from typing import List, Optional
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, List, Optional
 
 import aiohttp
 
 from .const import LOGGER
 
-from .auth import Auth
-from .models import ServerInfo, User, Light, UpdateList
+from .auth import Auth, build_data_req
+from .errors import CameDomoticError, CameDomoticServerError
+from .models import ServerInfo, User, Light, LightStatus, UpdateList
+
+# Pre-serialized payloads of the commands used to poll the server: only the client ID
+# and the command sequence number change between two requests, so the JSON is rendered
+# once here and then filled in with a single string substitution per request (see
+# build_data_req for the envelope shared by the "sl_data_req" commands).
+_USERS_LIST_PAYLOAD_TEMPLATE = '{"sl_client_id":"%s","sl_cmd":"sl_users_list_req"}'
+_LIGHT_LIST_EXTRA = ',"topologic_scope":"plant","value":0'
+
+# Data fetched by CameDomoticAPI.async_get_all when not told otherwise
+_GET_ALL_DEFAULT_INCLUDE = ("users", "server_info", "lights", "updates")
 
 
 class CameDomoticAPI:
     """Main class, exposes all the public methods of the CAME Domotic API."""
 
-    def __init__(self, auth: Auth):
+    __slots__ = ("auth", "_cache", "_cache_ttl_sec", "__weakref__")
+
+    def __init__(self, auth: Auth, *, cache_ttl_sec: float = 0):
         """Initialize the CAME Domotic API object.
 
         Args:
             auth (Auth): the authentication object used to interact with
                 the CAME Domotic API.
+            cache_ttl_sec (float, optional): how long (in seconds) the users list and
+                the server information, which hardly ever change, are served from
+                cache (default: 0, no caching).
         """
         self.auth = auth
+        # Cached responses, as {key: (expiration time, value)}
+        self._cache: dict[str, tuple[float, Any]] = {}
+        self._cache_ttl_sec = cache_ttl_sec
 
     async def __aenter__(self):
         return self
@@ -45,11 +65,59 @@ class CameDomoticAPI:
         await self.async_dispose()
 
     async def async_dispose(self):
-        """Dispose the CameDomoticAPI object."""
+        """Dispose the CameDomoticAPI object.
+
+        Network and server errors raised while logging out or closing the session are
+        logged and swallowed, any other (unexpected) error is propagated.
+        """
         try:
             await self.auth.async_dispose()
-        except Exception:  # pylint: disable=broad-except
-            LOGGER.exception("Error while disposing the CameDomoticAPI object")
+        except (aiohttp.ClientError, CameDomoticError, OSError) as e:
+            LOGGER.warning("Error while disposing the CameDomoticAPI object: %s", e)
+
+    def invalidate_cache(self, prefix: Optional[str] = None) -> None:
+        """Drop the cached responses, so that the next requests hit the server.
+
+        Args:
+            prefix (str, optional): Drop only the entries whose key starts with this
+                prefix ("users", "server_info"); if not provided, drop them all.
+        """
+        if prefix is None:
+            self._cache.clear()
+        else:
+            for key in [key for key in self._cache if key.startswith(prefix)]:
+                del self._cache[key]
+
+    async def _async_cached(
+        self, key: str, coro_factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Get a value from the cache, fetching (and caching) it if missing or stale.
+
+        Args:
+            key (str): Cache key.
+            coro_factory (Callable[[], Awaitable[Any]]): Fetches the value.
+
+        Returns:
+            Any: The cached or freshly fetched value.
+        """
+        cached = self._cache.get(key)
+        if cached is not None and asyncio.get_running_loop().time() < cached[0]:
+            return cached[1]
+
+        value = await coro_factory()
+        self._store_cached(key, value)
+        return value
+
+    def _store_cached(self, key: str, value: Any) -> None:
+        """Store a freshly fetched value in the cache, if caching is enabled.
+
+        Args:
+            key (str): Cache key.
+            value (Any): The value to cache.
+        """
+        if self._cache_ttl_sec > 0:
+            expiration = asyncio.get_running_loop().time() + self._cache_ttl_sec
+            self._cache[key] = (expiration, value)
 
     async def async_get_users(self) -> List[User]:
         """Get the list of users defined on the server.
@@ -60,15 +128,21 @@ class CameDomoticAPI:
         Raises:
             CameDomoticAuthError: If the authentication fails.
             CameDomoticServerError: If the server returns an error.
-        """
 
-        client_id = await self.auth.async_get_valid_client_id()
-        payload = {"sl_client_id": client_id, "sl_cmd": "sl_users_list_req"}
+        Note:
+            If the object was created with a ``cache_ttl_sec``, the list is served
+            from cache for that long; use ``invalidate_cache`` to force a new request
+            to the server.
+        """
 
-        response = await self.auth.async_send_command(payload)
-        json_response = await response.json(content_type=None)
+        async def _async_fetch() -> List[User]:
+            client_id = await self.auth.async_get_valid_client_id()
+            return await self._async_get_users(client_id, self.auth.reserve_cseq())
 
-        return [User(user, self.auth) for user in json_response["sl_users_list"]]
+        users = await self._async_cached("users", _async_fetch)
+        # Copy the list only if it is (or was) cached, so that callers can't alter
+        # the cached one; without caching, the fresh list is already the caller's
+        return list(users) if self._cache_ttl_sec > 0 else users
 
     async def async_get_server_info(self) -> ServerInfo:
         """Get the server information
@@ -82,30 +156,20 @@ class CameDomoticAPI:
         Raises:
             CameDomoticAuthError: If the authentication fails.
             CameDomoticServerError: If the server returns an error.
+
+        Note:
+            If the object was created with a ``cache_ttl_sec``, the server information
+            is served from cache for that long; use ``invalidate_cache`` to force a
+            new request to the server.
         """
 
-        client_id = await self.auth.async_get_valid_client_id()
-        payload = {
-            "sl_appl_msg": {
-                "client": client_id,
-                "cmd_name": "feature_list_req",
-                "cseq": self.auth.cseq + 1,
-            },
-            "sl_appl_msg_type": "domo",
-            "sl_client_id": client_id,
-            "sl_cmd": "sl_data_req",
-        }
-        response = await self.auth.async_send_command(payload)
-        json_response = await response.json(content_type=None)
+        async def _async_fetch() -> ServerInfo:
+            client_id = await self.auth.async_get_valid_client_id()
+            return await self._async_get_server_info(
+                client_id, self.auth.reserve_cseq()
+            )
 
-        return ServerInfo(
-            keycode=json_response["keycode"],
-            swver=json_response["swver"],
-            type=json_response["type"],
-            board=json_response["board"],
-            serial=json_response["serial"],
-            list=json_response["list"],
-        )
+        return await self._async_cached("server_info", _async_fetch)
 
     async def async_get_lights(self) -> List[Light]:
         """Get the list of all the light devices defined on the server.
@@ -119,22 +183,32 @@ class CameDomoticAPI:
         """
 
         client_id = await self.auth.async_get_valid_client_id()
-        payload = {
-            "sl_appl_msg": {
-                "client": client_id,
-                "cmd_name": "light_list_req",
-                "cseq": self.auth.cseq + 1,
-                "topologic_scope": "plant",
-                "value": 0,
-            },
-            "sl_appl_msg_type": "domo",
-            "sl_client_id": client_id,
-            "sl_cmd": "sl_data_req",
-        }
-        response = await self.auth.async_send_command(payload)
-        json_response = await response.json(content_type=None)
+        return await self._async_get_lights(client_id, self.auth.reserve_cseq())
+
+    async def async_iter_lights(self) -> AsyncIterator[Light]:
+        """Iterate over the light devices defined on the server.
+
+        Unlike ``async_get_lights``, no list is built: each ``Light`` object is created
+        only when the iteration reaches it, so callers looking for specific lights
+        can stop early without paying for all the others.
+
+        Yields:
+            Light: The next light.
 
-        return [Light(light, self.auth) for light in json_response["array"]]
+        Raises:
+            CameDomoticAuthError: If the authentication fails.
+            CameDomoticServerError: If the server returns an error.
+        """
+
+        client_id = await self.auth.async_get_valid_client_id()
+        # The whole response is received (and its ACK checked) before yielding, so
+        # that an error reported by the server is never mixed up with partial data
+        raw_lights = await self._async_get_raw_lights(
+            client_id, self.auth.reserve_cseq()
+        )
+        auth = self.auth
+        for light in raw_lights:
+            yield Light(light, auth)
 
     async def async_get_updates(self) -> UpdateList:
         """Get the list of status updates from the server.
@@ -148,18 +222,192 @@ class CameDomoticAPI:
         """
 
         client_id = await self.auth.async_get_valid_client_id()
-        payload = {
-            "sl_appl_msg": {
-                "client": client_id,
-                "cmd_name": "status_update_req",
-                "cseq": self.auth.cseq + 1,
-            },
-            "sl_appl_msg_type": "domo",
-            "sl_client_id": client_id,
-            "sl_cmd": "sl_data_req",
+        return await self._async_get_updates(client_id, self.auth.reserve_cseq())
+
+    async def async_refresh_all(self) -> tuple[ServerInfo, List[Light], UpdateList]:
+        """Get the server information, the lights and the status updates at once.
+
+        The three requests are sent concurrently (over the keep-alive connections of
+        the aiohttp session) rather than one after the other, so that a full refresh
+        costs about one round-trip instead of three. The fresh server information
+        also replaces the cached one, if caching is enabled.
+
+        Returns:
+            tuple[ServerInfo, List[Light], UpdateList]: Server information, list of
+                lights and list of status updates.
+
+        Raises:
+            CameDomoticAuthError: If the authentication fails.
+            CameDomoticServerError: If the server returns an error.
+        """
+
+        client_id = await self.auth.async_get_valid_client_id()
+        # Reserve a block of sequence numbers up front, one for each request
+        cseq = self.auth.reserve_cseq(3)
+        server_info, lights, updates = await asyncio.gather(
+            self._async_get_server_info(client_id, cseq),
+            self._async_get_lights(client_id, cseq + 1),
+            self._async_get_updates(client_id, cseq + 2),
+        )
+        self._store_cached("server_info", server_info)
+        return server_info, lights, updates
+
+    async def async_set_lights_status(
+        self,
+        lights: Iterable[Light],
+        status: LightStatus,
+        brightness: Optional[int] = None,
+    ) -> None:
+        """Set the status of several lights at once.
+
+        The commands are sent concurrently, sharing a single client ID validation
+        and a block of sequence numbers reserved up front, so that switching a group
+        of lights costs about one round-trip instead of one per light.
+
+        Args:
+            lights (Iterable[Light]): Lights to control.
+            status (LightStatus): Status to set on all the lights.
+            brightness (Optional[int]): Brightness percentage (range 0-100) to set on
+                the dimmable lights. It is ignored for non-dimmable lights.
+
+        Raises:
+            CameDomoticAuthError: If the authentication fails.
+            CameDomoticServerError: If any of the commands fails, reporting the
+                errors of all the failed commands. The other commands are still
+                sent, and the lights they control are updated.
+        """
+
+        lights = list(lights)
+        if not lights:
+            return
+
+        client_id = await self.auth.async_get_valid_client_id()
+        # Reserve a block of sequence numbers up front, one for each command
+        cseq = self.auth.reserve_cseq(len(lights))
+        # Wait for all the commands, even if some of them fail, so that no error is
+        # left unretrieved
+        results = await asyncio.gather(
+            *(
+                light._async_send_status(  # pylint: disable=protected-access
+                    status, brightness, client_id, seq
+                )
+                for seq, light in enumerate(lights, cseq)
+            ),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            raise CameDomoticServerError(
+                f"Failed to set the status of {len(errors)} of {len(lights)} lights: "
+                + "; ".join(str(error) for error in errors)
+            ) from errors[0]
+
+    async def async_get_all(
+        self, *, include: Iterable[str] = _GET_ALL_DEFAULT_INCLUDE
+    ) -> dict[str, Any]:
+        """Get several kinds of data from the server at once.
+
+        All the requested lists are fetched concurrently, sharing the keep-alive
+        connections of the aiohttp session, so that the overall latency is the one of
+        the slowest request rather than the sum of all of them. Unlike
+        ``async_refresh_all``, a failing request doesn't make the whole call fail:
+        its exception is returned in place of the result. The fresh users list and
+        server information also replace the cached ones, if caching is enabled.
+
+        Args:
+            include (Iterable[str], optional): What to fetch, among "users",
+                "server_info", "lights" and "updates" (default: all of them).
+
+        Returns:
+            dict[str, Any]: The result of each request (or the exception it raised),
+                keyed by the names in ``include``.
+
+        Raises:
+            ValueError: If ``include`` contains an unknown name.
+            CameDomoticAuthError: If the authentication fails.
+        """
+
+        getters = {
+            "users": self._async_get_users,
+            "server_info": self._async_get_server_info,
+            "lights": self._async_get_lights,
+            "updates": self._async_get_updates,
         }
-        response = await self.auth.async_send_command(payload)
-        json_response = await response.json(content_type=None)
+        include = tuple(include)
+        unknown = [name for name in include if name not in getters]
+        if unknown:
+            raise ValueError(f"Unknown data to fetch: {', '.join(unknown)}")
+
+        client_id = await self.auth.async_get_valid_client_id()
+        # Reserve a block of sequence numbers up front, one for each request
+        cseq = self.auth.reserve_cseq(len(include))
+        results = await asyncio.gather(
+            *(getters[name](client_id, seq) for seq, name in enumerate(include, cseq)),
+            return_exceptions=True,
+        )
+        results_by_name = dict(zip(include, results))
+        for name in ("users", "server_info"):
+            result = results_by_name.get(name)
+            if result is not None and not isinstance(result, BaseException):
+                # Copy, so that callers can't alter the cached list
+                self._store_cached(
+                    name, list(result) if isinstance(result, list) else result
+                )
+        return results_by_name
+
+    async def _async_get_users(
+        self, client_id: str, cseq: int  # pylint: disable=unused-argument
+    ) -> List[User]:
+        """Send the users list request, with the given client ID.
+
+        The request carries no sequence number, ``cseq`` is accepted only for
+        consistency with the other private getters.
+        """
+
+        command = _USERS_LIST_PAYLOAD_TEMPLATE % client_id
+        json_response = await self.auth.async_send_raw(command)
+
+        # Local names, so that the loop doesn't look them up again for each item
+        user_cls, auth = User, self.auth
+        return [
+            user_cls(user, auth) for user in json_response.get("sl_users_list") or ()
+        ]
+
+    async def _async_get_server_info(self, client_id: str, cseq: int) -> ServerInfo:
+        """Send the feature list request, with the given client ID and sequence."""
+
+        command = build_data_req(client_id, "feature_list_req", cseq)
+        json_response = await self.auth.async_send_raw(command)
+
+        return ServerInfo(
+            keycode=json_response["keycode"],
+            swver=json_response["swver"],
+            type=json_response["type"],
+            board=json_response["board"],
+            serial=json_response["serial"],
+            list=json_response["list"],
+        )
+
+    async def _async_get_lights(self, client_id: str, cseq: int) -> List[Light]:
+        """Send the light list request, with the given client ID and sequence."""
+
+        raw_lights = await self._async_get_raw_lights(client_id, cseq)
+        return Light.from_raw_list(raw_lights, self.auth)
+
+    async def _async_get_raw_lights(
+        self, client_id: str, cseq: int
+    ) -> Iterable[dict[str, Any]]:
+        """Send the light list request, returning the raw data of the lights."""
+
+        command = build_data_req(client_id, "light_list_req", cseq, _LIGHT_LIST_EXTRA)
+        json_response = await self.auth.async_send_raw(command)
+        return json_response.get("array") or ()
+
+    async def _async_get_updates(self, client_id: str, cseq: int) -> UpdateList:
+        """Send the status update request, with the given client ID and sequence."""
+
+        command = build_data_req(client_id, "status_update_req", cseq)
+        json_response = await self.auth.async_send_raw(command)
         return UpdateList(json_response)
 
     @classmethod
@@ -171,6 +419,8 @@ class CameDomoticAPI:
         *,
         websession: Optional[aiohttp.ClientSession] = None,
         close_websession_on_disposal: bool = False,
+        validate_host: bool = True,
+        cache_ttl_sec: float = 0,
     ):
         """Create a CameDomoticAPI object.
 
@@ -179,29 +429,44 @@ class CameDomoticAPI:
             username (str): The username to use for the API.
             password (str): The password to use for the API.
             websession (aiohttp.ClientSession, optional): The aiohttp session to use for
-                the API. If not provided, a new aiohttp.ClientSession will be created.
+                the API. If not provided, a new aiohttp.ClientSession will be created,
+                with a connection pool tuned for the CAME Domotic server (see
+                ``Auth.create_websession``).
             close_websession_on_disposal (bool, default False): If True, the aiohttp
                 session will be closed when the CameDomoticAPI object is disposed. If
                 the websession is not provided, this argument is ignored and the session
                 will always be closed.
+            validate_host (bool, default True): If True, the host is probed with an
+                HTTP request before returning. If False, the probe is skipped to save a
+                round-trip, and an unreachable host is reported by the first command
+                (the login) instead.
+            cache_ttl_sec (float, default 0): How long (in seconds) the users list
+                and the server information are served from cache. The default (0)
+                disables the cache, so that every call hits the server.
 
         Returns:
             CameDomoticAPI: The CameDomoticAPI object.
 
         Raises:
             CameDomoticServerNotFoundError: if the host doesn't respond to an HTTP
-                request or doesn't expose the CAME Domotic API endopoint.
+                request or doesn't expose the CAME Domotic API endopoint (only when
+                ``validate_host`` is True).
 
         Note:
             The session is not logged in until the first request is made.
+
+            Long-lived applications talking to the CAME Domotic server should share a
+            single ``aiohttp.ClientSession`` (passed as ``websession``), so that all
+            the requests reuse the same pool of keep-alive connections.
         """
         auth = await Auth.async_create(
-            websession or aiohttp.ClientSession(),
+            websession or Auth.create_websession(),
             host,
             username,
             password,
             close_websession_on_disposal=(
                 close_websession_on_disposal if websession else True
             ),
+            validate_host=validate_host,
         )
-        return cls(auth)
+        return cls(auth, cache_ttl_sec=cache_ttl_sec)
@@ -22,10 +22,12 @@ LOGGER = logging.getLogger(__package__)
 class EntityValidator:
     """Mixin class to validate the CAME entities."""
 
+    __slots__ = ()
+
     @staticmethod
     def get_validator() -> "EntityValidator":
         """Return an instance of the validator."""
-        return EntityValidator()
+        return _VALIDATOR
 
     def validate_data(self, data, required_keys) -> None:
         """
@@ -33,7 +35,7 @@ class EntityValidator:
 
         Args:
             data (dict): The data dictionary to validate.
-            required_keys (list): A list of keys that must be present in the data.
+            required_keys (Iterable): The keys that must be present in the data.
 
         Raises:
             ValueError: If any required key is missing from the data.
@@ -41,8 +43,13 @@ class EntityValidator:
         if not isinstance(data, dict):
             raise ValueError("Provided data must be a dictionary.")
 
-        missing_keys = [key for key in required_keys if key not in data]
-        if missing_keys:
-            raise ValueError(
-                f"Data is missing required keys: {', '.join(missing_keys)}"
-            )
+        for key in required_keys:
+            if key not in data:
+                # Error path only: collect all the missing keys for the message
+                missing_keys = [key for key in required_keys if key not in data]
+                raise ValueError(
+                    f"Data is missing required keys: {', '.join(missing_keys)}"
+                )
+
+
+_VALIDATOR = EntityValidator()
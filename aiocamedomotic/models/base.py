@@ -28,8 +28,11 @@ from ..const import (
 class CameEntity:
     """Base class for all the CAME entities."""
 
+    # Empty, so that the subclasses declaring __slots__ don't get a __dict__ anyway
+    __slots__ = ()
 
-@dataclass
+
+@dataclass(slots=True, weakref_slot=True)
 class User(CameEntity):
     """
     User in the CAME Domotic API.
@@ -42,9 +45,12 @@ class User(CameEntity):
     raw_data: dict
     auth: Auth
 
+    # Keys that the raw data of a user must contain
+    _REQUIRED_KEYS = ("name",)
+
     def __post_init__(self):
         EntityValidator.get_validator().validate_data(
-            self.raw_data, required_keys=["name"]
+            self.raw_data, required_keys=User._REQUIRED_KEYS
         )
 
     @property
@@ -73,7 +79,7 @@ class User(CameEntity):
             await self._attempt_login_as_current_user(password)
         except CameDomoticAuthError as e:
             LOGGER.error("Unable to set user '%s' as current user (%s)", self.name, e)
-            await self.auth.restore_auth_credentials(backup_user)
+            self.auth.restore_auth_credentials(backup_user)
             raise
 
     async def _attempt_login_as_current_user(self, password: str) -> None:
@@ -86,11 +92,11 @@ class User(CameEntity):
             CameDomoticAuthError: If login fails.
         """
         await self.auth.async_logout()
-        self.auth.update_auth_credentials(self.name, password)
+        await self.auth.async_update_auth_credentials(self.name, password)
         await self.auth.async_login()
 
 
-@dataclass
+@dataclass(slots=True, weakref_slot=True)
 class ServerInfo(CameEntity):
     """Server information of a CAME Domotic server."""
 
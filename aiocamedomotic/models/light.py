@@ -14,11 +14,11 @@
 
 # This module contains the classes for the CAME Domotic lights.
 
-from dataclasses import dataclass
-from enum import Enum
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from enum import IntEnum, StrEnum
+from typing import Iterable, List, Optional
 
-from ..auth import Auth
+from ..auth import Auth, build_data_req
 from ..const import (
     EntityValidator,
     LOGGER,
@@ -26,8 +26,13 @@ from ..const import (
 
 from .base import CameEntity
 
+# Pre-serialized members of the light switch command, with and without brightness,
+# filled in with (act_id, wanted status[, perc])
+_LIGHT_SWITCH_EXTRA_TEMPLATE = ',"act_id":%d,"wanted_status":%d'
+_LIGHT_SWITCH_PERC_EXTRA_TEMPLATE = ',"act_id":%d,"wanted_status":%d,"perc":%d'
 
-class LightStatus(Enum):
+
+class LightStatus(IntEnum):
     """Status of a light.
 
     Allowed values are:
@@ -39,7 +44,7 @@ class LightStatus(Enum):
     ON = 1
 
 
-class LightType(Enum):
+class LightType(StrEnum):
     """Type of a light.
 
     Allowed values are:
@@ -51,7 +56,17 @@ class LightType(Enum):
     DIMMER = "DIMMER"
 
 
-@dataclass
+# Value-to-member maps of the enums above, for lookups cheaper than an Enum call (the
+# type is looked up even when missing from the raw data, hence the Optional key)
+_LIGHT_STATUSES: dict[int, LightStatus] = {
+    status.value: status for status in LightStatus
+}
+_LIGHT_TYPES: dict[Optional[str], LightType] = {
+    type_.value: type_ for type_ in LightType
+}
+
+
+@dataclass(slots=True, weakref_slot=True)
 class Light(CameEntity):
     """
     Light entity in the CameDomotic API.
@@ -64,35 +79,100 @@ class Light(CameEntity):
     raw_data: dict
     auth: Auth
 
+    # Keys that the raw data of a light must contain
+    _REQUIRED_KEYS = ("act_id",)
+
+    # The attributes identifying the light never change, so they are read from
+    # raw_data once and then served from slots. The status and the brightness are
+    # device state instead, so they are always read from raw_data.
+    _act_id: int = field(init=False, repr=False, compare=False)
+    _floor_ind: Optional[int] = field(init=False, repr=False, compare=False)
+    _name: Optional[str] = field(init=False, repr=False, compare=False)
+    _room_ind: Optional[int] = field(init=False, repr=False, compare=False)
+    _type: Optional[LightType] = field(init=False, repr=False, compare=False)
+
     def __post_init__(self):
         EntityValidator.get_validator().validate_data(
-            self.raw_data, required_keys=["act_id"]
+            self.raw_data, required_keys=Light._REQUIRED_KEYS
         )
+        self._read_identity(self.raw_data)
+
+    @classmethod
+    def from_raw_list(cls, items: Iterable[dict], auth: Auth) -> List["Light"]:
+        """Build the lights for a list of raw light data, in a single pass.
+
+        Equivalent to ``[Light(item, auth) for item in items]``, but the validator
+        and the required keys are looked up once for the whole list, and the
+        dataclass ``__init__`` is skipped.
+
+        Args:
+            items (Iterable[dict]): the raw data of the lights.
+            auth (Auth): the authentication object shared by all the lights.
+
+        Returns:
+            List[Light]: the lights, in the same order as the raw data.
+
+        Raises:
+            ValueError: If the raw data of any light is not valid.
+        """
+        validate = EntityValidator.get_validator().validate_data
+        required_keys = cls._REQUIRED_KEYS
+        new = object.__new__
+
+        lights: List["Light"] = []
+        append = lights.append
+        for raw_data in items:
+            validate(raw_data, required_keys)
+            light = new(cls)
+            light.raw_data = raw_data
+            light.auth = auth
+            light._read_identity(raw_data)  # pylint: disable=protected-access
+            append(light)
+        return lights
+
+    def _read_identity(self, raw_data: dict) -> None:
+        """Read the identity attributes of the light from its (validated) data."""
+        self._act_id = raw_data["act_id"]
+        self._floor_ind = raw_data.get("floor_ind")
+        self._name = raw_data.get("name")
+        self._room_ind = raw_data.get("room_ind")
+        # Resolved through the value map of the enum, which is a plain dict lookup
+        # instead of a full (and much slower) Enum call
+        self._type = _LIGHT_TYPES.get(raw_data.get("type"))
 
     @property
     def act_id(self) -> int:
         """ID of the light."""
-        return self.raw_data["act_id"]
+        return self._act_id
+
+    # The optional attributes fall back to raw_data when missing, so that a light
+    # without them keeps raising KeyError as before.
 
     @property
     def floor_ind(self) -> int:
         """Floor index of the light."""
-        return self.raw_data["floor_ind"]
+        floor_ind = self._floor_ind
+        return floor_ind if floor_ind is not None else self.raw_data["floor_ind"]
 
     @property
     def name(self) -> str:
         """Name of the light."""
-        return self.raw_data["name"]
+        name = self._name
+        return name if name is not None else self.raw_data["name"]
 
     @property
     def room_ind(self) -> int:
         """Room index of the light."""
-        return self.raw_data["room_ind"]
+        room_ind = self._room_ind
+        return room_ind if room_ind is not None else self.raw_data["room_ind"]
 
     @property
     def status(self) -> LightStatus:
         """Status of the light. Allowed values are ON (1) and OFF (0)."""
-        return LightStatus(self.raw_data["status"])
+        status = self.raw_data["status"]
+        member = _LIGHT_STATUSES.get(status)
+        # Fall back to the Enum call only to raise the usual ValueError
+        return member if member is not None else LightStatus(status)
 
     @property
     def type(self) -> LightType:
@@ -103,6 +183,9 @@ class Light(CameEntity):
         Raises:
             ValueError: If the light type is not recognized.
         """
+        if self._type is not None:
+            return self._type
+
         try:
             return LightType(self.raw_data["type"])
         except ValueError as e:
@@ -117,7 +200,11 @@ class Light(CameEntity):
         return self.raw_data.get("perc", 100)
 
     async def async_set_status(
-        self, status: LightStatus, brightness: Optional[int] = None
+        self,
+        status: LightStatus,
+        brightness: Optional[int] = None,
+        *,
+        skip_if_unchanged: bool = False,
     ) -> None:
         """Control the light.
 
@@ -126,47 +213,85 @@ class Light(CameEntity):
             brightness (Optional[int]): Brightness percentage of the light (range
                 0-100). If the brightness is not provided, it will stay unchanged.
                 This argument is ignored for non-dimmable lights.
+            skip_if_unchanged (bool): If True, no command is sent when the last known
+                status (and brightness, if provided) of the light already match the
+                requested ones. Defaults to False, since the last known state may be
+                outdated if the light has been operated elsewhere.
 
         Raises:
             CameDomoticAuthError: If the authentication fails.
             CameDomoticServerError: If the server returns an error.
         """
-        # Early exit for non-dimmable lights receiving a brightness value
-        if self.type != LightType.DIMMER:
-            brightness = None  # Ignore brightness since it's not applicable
+        if skip_if_unchanged:
+            raw_data = self.raw_data
+            perc = self._normalize_brightness(brightness)
+            if raw_data.get("status") == status and (
+                perc is None or raw_data.get("perc") == perc
+            ):
+                return
 
         client_id = await self.auth.async_get_valid_client_id()
         LOGGER.debug(
             "User authenticated, sending 'light_switch_req' command to the API."
         )
-        payload = self._prepare_light_payload(status, brightness, client_id)
-        await self.auth.async_send_command(payload)
+        await self._async_send_status(
+            status, brightness, client_id, self.auth.reserve_cseq()
+        )
+
+    def _normalize_brightness(self, brightness: Optional[int]) -> Optional[int]:
+        """Return the brightness to send to the light, clamped to the 0-100 range.
+
+        Non-dimmable lights ignore the brightness, so None is returned for them.
+        """
+        if self.type is not LightType.DIMMER or brightness is None:
+            return None
+        return 0 if brightness < 0 else 100 if brightness > 100 else brightness
+
+    async def _async_send_status(
+        self,
+        status: LightStatus,
+        brightness: Optional[int],
+        client_id: str,
+        cseq: int,
+    ) -> None:
+        """Send the light switch command, then update the state of the light.
+
+        The client ID is not validated and no sequence number is reserved here, so
+        that several commands can share them (see
+        ``CameDomoticAPI.async_set_lights_status``).
+
+        Args:
+            status (LightStatus): Status of the light.
+            brightness (Optional[int]): Brightness percentage of the light, clamped
+                to the 0-100 range. It is ignored for non-dimmable lights.
+            client_id (str): A valid client ID.
+            cseq (int): Sequence number of the command, as reserved with
+                ``Auth.reserve_cseq``.
+        """
+        brightness = self._normalize_brightness(brightness)
+        command = self._prepare_light_command(status, brightness, client_id, cseq)
+        await self.auth.async_send_raw(command)
 
         # Update the status of the light if everything went as expected
         self.raw_data["status"] = status
         if brightness is not None:
-            self.raw_data["perc"] = max(0, min(brightness, 100))
-
-    def _prepare_light_payload(
-        self, status: LightStatus, brightness: Optional[int], client_id: str
-    ) -> Dict:
-        """Prepare the payload for the light control API call."""
-        payload = {
-            "sl_appl_msg": {
-                "act_id": self.act_id,
-                "client": client_id,
-                "cmd_name": "light_switch_req",
-                "cseq": self.auth.cseq + 1,
-                "wanted_status": status.value,
-            },
-            "sl_appl_msg_type": "domo",
-            "sl_client_id": client_id,
-            "sl_cmd": "sl_data_req",
-        }
-
-        if brightness is not None and isinstance(brightness, int):
-            payload["sl_appl_msg"]["perc"] = max(  # type: ignore
-                0, min(brightness, 100)
-            )  # Normalize and add brightness
-
-        return payload
+            self.raw_data["perc"] = brightness
+
+    def _prepare_light_command(
+        self,
+        status: LightStatus,
+        brightness: Optional[int],
+        client_id: str,
+        cseq: int,
+    ) -> str:
+        """Prepare the (JSON-encoded) command for the light control API call.
+
+        The brightness, if any, is expected to be already in the 0-100 range.
+        """
+        act_id = self._act_id
+        if isinstance(brightness, int):
+            extra = _LIGHT_SWITCH_PERC_EXTRA_TEMPLATE % (act_id, status, brightness)
+        else:
+            extra = _LIGHT_SWITCH_EXTRA_TEMPLATE % (act_id, status)
+
+        return build_data_req(client_id, "light_switch_req", cseq, extra)
@@ -16,7 +16,7 @@
 
 from dataclasses import dataclass
 
-from typing import Any
+from typing import Any, Iterator
 from collections import UserList
 
 from .base import CameEntity
@@ -28,9 +28,15 @@ class UpdateList(UserList[dict[str, Any]], CameEntity):
 
     _raw_data: dict[str, Any] | None
 
-    def __init__(self, raw_data: dict[str, Any] | None = None):
+    def __init__(
+        self, raw_data: dict[str, Any] | None = None
+    ):  # pylint: disable=super-init-not-called
         self._raw_data = raw_data
-        if isinstance(raw_data, dict):
-            super().__init__(raw_data.get("result", []))
-        else:
-            super().__init__()
+        result = raw_data.get("result") if isinstance(raw_data, dict) else None
+        # Wrap the list of the response as it is, instead of letting UserList copy it
+        self.data = result if isinstance(result, list) else list(result or ())
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        # UserList has no __iter__ of its own, so iterating would otherwise go
+        # through the Sequence mixin, one __getitem__ call per update
+        return iter(self.data)
@@ -15,55 +15,108 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-function-docstring
 # pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
 
-import time
-from typing import AsyncGenerator
-from unittest.mock import patch
+import json
+from typing import Any, AsyncGenerator
+from unittest.mock import Mock
 import aiohttp
 import pytest
 
 from aiocamedomotic import Auth, CameDomoticAPI
 
 
+class FakeJsonResponse:
+    """Lightweight stand-in for an aiohttp response with a JSON body.
+
+    Only the members used by Auth are provided, which makes it much cheaper to
+    build than an AsyncMock. raise_for_status is still a Mock, to check its calls.
+    """
+
+    __slots__ = ("status", "raise_for_status", "_body")
+
+    def __init__(self, body: bytes, status: int):
+        self.status = status
+        self.raise_for_status = Mock()
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+def mock_json_response(body: Any, status: int = 200) -> FakeJsonResponse:
+    """Build a mocked aiohttp response, whose body is the JSON encoding of body.
+
+    A bytes body is returned as it is, e.g. to simulate an invalid JSON document.
+    """
+    return FakeJsonResponse(
+        body if isinstance(body, bytes) else json.dumps(body).encode(), status
+    )
+
+
+def disarm_disposal(auth: Auth) -> None:
+    """Prepare a fixture Auth for its disposal at teardown.
+
+    The shared aiohttp session must survive the test, even if the test enabled
+    close_websession_on_disposal, and the (mocked) login of the test must not turn
+    into a real logout request to the fake host.
+    """
+    auth.close_websession_on_disposal = False
+    auth.client_id = ""
+
+
 @pytest.fixture
-@patch("aiocamedomotic.Auth.async_validate_host", return_value=True)
 async def auth_instance_not_logged_in(
-    mock_async_validate_host,  # pylint: disable=unused-argument
+    shared_http_session: aiohttp.ClientSession,
 ) -> AsyncGenerator[Auth, None]:
-    async with aiohttp.ClientSession() as session:
-        async with await Auth.async_create(
-            session, "192.168.x.x", "username", "password"
-        ) as auth:
-            return auth
+    async with await Auth.async_create(
+        shared_http_session,
+        "192.168.x.x",
+        "username",
+        "password",
+        close_websession_on_disposal=False,
+        validate_host=False,
+    ) as auth:
+        yield auth
+        disarm_disposal(auth)
 
 
 @pytest.fixture
-@patch("aiocamedomotic.Auth.async_validate_host", return_value=True)
 async def auth_instance(
-    mock_async_validate_host,  # pylint: disable=unused-argument
+    shared_http_session: aiohttp.ClientSession,
 ) -> AsyncGenerator[Auth, None]:
-    async with aiohttp.ClientSession() as session:
-        async with await Auth.async_create(
-            session, "192.168.x.x", "username", "password"
-        ) as auth:
-            auth.client_id = "test_client_id"
-            auth.keep_alive_timeout_sec = 900  # 15min
-            auth.session_expiration_timestamp = time.monotonic() + (60 * 60)  # 1h
-            return auth
+    async with await Auth.async_create(
+        shared_http_session,
+        "192.168.x.x",
+        "username",
+        "password",
+        close_websession_on_disposal=False,
+        validate_host=False,
+    ) as auth:
+        auth.client_id = "test_client_id"
+        auth.keep_alive_timeout_sec = 900  # 15min
+        auth.session_expiration_timestamp = Auth._now() + (60 * 60)  # 1h
+        yield auth
+        disarm_disposal(auth)
 
 
 @pytest.fixture
-@patch("aiocamedomotic.Auth.async_validate_host", return_value=True)
 async def api_instance(
-    mock_async_validate_host,  # pylint: disable=unused-argument
+    shared_http_session: aiohttp.ClientSession,
 ) -> AsyncGenerator[CameDomoticAPI, None]:
     async with await CameDomoticAPI.async_create(
-        "192.168.x.x", "username", "password"
+        "192.168.x.x",
+        "username",
+        "password",
+        websession=shared_http_session,
+        close_websession_on_disposal=False,
+        validate_host=False,
     ) as api:
         api.auth.client_id = "my_client_id"
         api.auth.keep_alive_timeout_sec = 900  # 15min
-        api.auth.session_expiration_timestamp = time.monotonic() + (60 * 60)  # 1h
-        return api
+        api.auth.session_expiration_timestamp = Auth._now() + (60 * 60)  # 1h
+        yield api
+        disarm_disposal(api.auth)
 
 
 @pytest.fixture
@@ -15,43 +15,72 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-function-docstring
 # pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
 # flake8: noqa: F811
 
 import asyncio
 import json
+import re
 import time
+import weakref
 from unittest.mock import AsyncMock, Mock, patch
+from urllib.parse import urlencode
 
 from cryptography.fernet import Fernet
 
 import aiohttp
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import ClientSession, ClientTimeout, web
+from aiohttp.test_utils import TestServer
 import pytest
-import freezegun
+from multidict import CIMultiDict
+from yarl import URL
 
 from aiocamedomotic import Auth
+import aiocamedomotic.auth
+from aiocamedomotic.auth import (
+    _LOGIN_ACK_ERROR_MESSAGES,
+    build_data_req,
+    encode_command_form,
+    json_dumps,
+    json_loads,
+)
 from aiocamedomotic.errors import (
     CameDomoticServerError,
     CameDomoticAuthError,
     CameDomoticServerNotFoundError,
 )
 from tests.aiocamedomotic.const import (
+    mock_json_response,
     auth_instance,  # noqa: F401
     auth_instance_not_logged_in,  # noqa: F401
 )
 
 
-@freezegun.freeze_time(
-    "2022-01-01 12:00:00"
-)  # To ensure that the session expiration timestamp is in the past
-async def test_init():
-    session = ClientSession()
-    auth = Auth(session, "192.168.x.x", "user", "password")
-    assert auth.websession == session
+@pytest.fixture
+async def fixture_loop(auth_instance) -> asyncio.AbstractEventLoop:
+    # Loop on which the async fixtures run (auth_instance is set up on it too)
+    return asyncio.get_running_loop()
+
+
+async def test_fixtures_share_the_session_loop(
+    fixture_loop, shared_http_session, auth_instance
+):
+    # The per-test fixtures must run on the loop of the shared aiohttp session,
+    # otherwise their requests (e.g. the logout at teardown) fail
+    loop = asyncio.get_running_loop()
+    assert fixture_loop is loop
+    assert shared_http_session._loop is loop  # pylint: disable=protected-access
+    assert auth_instance.websession is shared_http_session
+
+
+async def test_init(shared_http_session):
+    auth = Auth(shared_http_session, "192.168.x.x", "user", "password")
+    assert auth.websession == shared_http_session
     assert auth.host == "192.168.x.x"
     assert auth.cipher_suite.decrypt(auth.username).decode() == "user"
     assert auth.cipher_suite.decrypt(auth.password).decode() == "password"
-    assert auth.session_expiration_timestamp < time.monotonic()
+    # A new instance starts with an already expired session
+    assert auth.session_expiration_timestamp < Auth._now()
     assert auth.client_id == ""
     assert auth.keep_alive_timeout_sec == 0
     assert auth.cseq == 0
@@ -60,12 +89,12 @@ async def test_init():
     assert isinstance(auth.cipher_suite, Fernet)
 
 
-@freezegun.freeze_time("2022-01-01 12:00:00")
 @patch.object(Auth, "async_validate_host", return_value=True)
-async def test_async_create(mock_validate_host):
-    session = ClientSession()
-    auth_create = await Auth.async_create(session, "192.168.x.x", "user", "password")
-    auth_init = Auth(session, "192.168.x.x", "user", "password")
+async def test_async_create(mock_validate_host, shared_http_session):
+    auth_create = await Auth.async_create(
+        shared_http_session, "192.168.x.x", "user", "password"
+    )
+    auth_init = Auth(shared_http_session, "192.168.x.x", "user", "password")
     assert auth_init.websession == auth_create.websession
     assert auth_init.host == auth_create.host
     assert (
@@ -76,10 +105,9 @@ async def test_async_create(mock_validate_host):
         auth_init.cipher_suite.decrypt(auth_init.password).decode()
         == auth_create.cipher_suite.decrypt(auth_create.password).decode()
     )
-    assert (
-        auth_init.session_expiration_timestamp
-        == auth_create.session_expiration_timestamp
-    )
+    # Both sessions are already expired
+    assert auth_init.session_expiration_timestamp < Auth._now()
+    assert auth_create.session_expiration_timestamp < Auth._now()
     assert auth_init.client_id == auth_create.client_id
     assert auth_init.keep_alive_timeout_sec == auth_create.keep_alive_timeout_sec
     assert auth_init.cseq == auth_create.cseq
@@ -95,20 +123,58 @@ async def test_async_create(mock_validate_host):
     mock_validate_host.assert_called_once()
 
 
+@patch.object(Auth, "async_validate_host")
+async def test_async_create_without_host_validation(
+    mock_validate_host, shared_http_session
+):
+    auth = await Auth.async_create(
+        shared_http_session, "192.168.x.x", "user", "password", validate_host=False
+    )
+
+    assert auth.host == "192.168.x.x"
+    mock_validate_host.assert_not_called()
+
+
 @patch.object(Auth, "async_validate_host", side_effect=CameDomoticServerNotFoundError)
-async def test_create_invalid_host(mock_validate_host):
-    session = ClientSession()
+async def test_create_invalid_host(mock_validate_host, shared_http_session):
     with pytest.raises(CameDomoticServerNotFoundError):
-        await Auth.async_create(session, "192.168.x.x", "user", "password")
+        await Auth.async_create(shared_http_session, "192.168.x.x", "user", "password")
     mock_validate_host.assert_called_once()
 
 
+async def test_create_websession():
+    async with Auth.create_websession() as session:
+        connector = session.connector
+        assert isinstance(connector, aiohttp.TCPConnector)
+        assert connector.limit == 10
+        assert connector.limit_per_host == 4
+        assert connector.force_close is False
+        assert connector.use_dns_cache is True
+        assert session.headers["Content-Type"] == "application/x-www-form-urlencoded"
+
+
+def test_default_http_headers():
+    headers = Auth._DEFAULT_HTTP_HEADERS
+    assert isinstance(headers, CIMultiDict)
+    assert headers["content-type"] == "application/x-www-form-urlencoded"
+    assert "Connection" not in headers
+
+
 async def test_get_endpoint_url(auth_instance):
-    assert auth_instance.get_endpoint_url() == "http://192.168.x.x/domo/"
+    assert auth_instance.get_endpoint_url() == URL("http://192.168.x.x/domo/")
+    assert str(auth_instance.get_endpoint_url()) == "http://192.168.x.x/domo/"
+
+
+@pytest.mark.parametrize("host", ["[::1", "host:abc"])
+async def test_async_validate_host_malformed_host(host, shared_http_session):
+    # The host is only parsed when the endpoint URL is first needed
+    auth = Auth(shared_http_session, host, "user", "password")
+    with pytest.raises(CameDomoticServerNotFoundError, match="Invalid"):
+        await auth.async_validate_host()
 
 
 @patch.object(Auth, "validate_session", return_value=True)
-@patch.object(Auth, "async_login", new_callable=AsyncMock)
+@patch.object(Auth, "_async_perform_login", new_callable=AsyncMock)
 async def test_async_get_valid_client_id_valid_session(
     mock_login, mock_validate_session, auth_instance
 ):
@@ -120,37 +186,61 @@ async def test_async_get_valid_client_id_valid_session(
 
 
 @patch.object(Auth, "validate_session", return_value=False)
-@patch.object(Auth, "async_login", new_callable=AsyncMock)
+@patch.object(Auth, "_async_perform_login", new_callable=AsyncMock)
 async def test_async_get_valid_client_id_invalid_session_successful_login(
     mock_login, mock_validate_session, auth_instance
 ):
     auth_instance.client_id = "test_client_id"
     client_id = await auth_instance.async_get_valid_client_id()
     assert client_id == "test_client_id"
-    mock_validate_session.assert_called_once()
+    # Checked before and after acquiring the lock
+    assert mock_validate_session.call_count == 2
     mock_login.assert_called_once()
 
 
 @patch.object(Auth, "validate_session", return_value=False)
 @patch.object(
-    Auth, "async_login", new_callable=AsyncMock, side_effect=CameDomoticAuthError
+    Auth,
+    "_async_perform_login",
+    new_callable=AsyncMock,
+    side_effect=CameDomoticAuthError,
 )
 async def test_async_get_valid_client_id_invalid_session_unsuccessful_login(
     mock_login, mock_validate_session, auth_instance
 ):
     with pytest.raises(CameDomoticAuthError):
         await auth_instance.async_get_valid_client_id()
-    mock_validate_session.assert_called_once()
+    assert mock_validate_session.call_count == 2
+    mock_login.assert_called_once()
+
+
+async def test_async_get_valid_client_id_concurrent_calls_login_once(
+    auth_instance_not_logged_in: Auth,
+):
+    auth = auth_instance_not_logged_in
+
+    async def login_side_effect():
+        await asyncio.sleep(0)
+        auth.client_id = "test_client_id"
+        auth.session_expiration_timestamp = time.monotonic() + 900
+
+    with patch.object(
+        Auth, "_async_perform_login", side_effect=login_side_effect
+    ) as mock_login:
+        client_ids = await asyncio.gather(
+            *(auth.async_get_valid_client_id() for _ in range(10))
+        )
+
+    assert client_ids == ["test_client_id"] * 10
     mock_login.assert_called_once()
 
 
 @patch.object(ClientSession, "post", new_callable=AsyncMock)
-@freezegun.freeze_time("2020-01-01")
-async def test_async_send_command_success(mock_post, auth_instance):
-    # Setup mock response with async json method returning the desired dictionary
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.json.return_value = {"sl_data_ack_reason": 0}
+@patch.object(Auth, "_now", return_value=1000.0)
+async def test_async_send_command_success(
+    mock_now, mock_post, auth_instance  # pylint: disable=unused-argument
+):
+    mock_response = mock_json_response({"sl_data_ack_reason": 0})
     mock_post.return_value = mock_response
 
     auth_instance.keep_alive_timeout_sec = 900
@@ -158,49 +248,113 @@ async def test_async_send_command_success(mock_post, auth_instance):
     payload = {"command": "test_command"}
     response = await auth_instance.async_send_command(payload)
 
-    assert response == mock_response
-    assert auth_instance.cseq == 1
+    assert response == {"sl_data_ack_reason": 0}
+    # The 2xx status is checked once, without going through raise_for_status
+    mock_response.raise_for_status.assert_not_called()
+    assert auth_instance.cseq == 0  # Only reserve_cseq advances the counter
     assert (
         auth_instance.session_expiration_timestamp
-        == time.monotonic() + auth_instance.keep_alive_timeout_sec - 30
+        == 1000.0 + auth_instance.keep_alive_timeout_sec - 30
     )
 
     mock_post.assert_called_once_with(
-        "http://192.168.x.x/domo/",
-        data={"command": json.dumps(payload)},
+        URL("http://192.168.x.x/domo/"),
+        data=urlencode({"command": json_dumps(payload)}).encode(),
         headers=Auth._DEFAULT_HTTP_HEADERS,  # pylint: disable=protected-access
-        timeout=10,
+        timeout=ClientTimeout(total=10),
     )
 
 
 @patch.object(ClientSession, "post", new_callable=AsyncMock)
-@freezegun.freeze_time("2020-01-01")
-async def test_async_send_command_bad_ack(mock_post, auth_instance):
-    # Setup mock response with async json method returning the desired dictionary
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.json.return_value = {"sl_data_ack_reason": 1}
+async def test_async_send_raw_success(mock_post, auth_instance):
+    mock_response = mock_json_response({"sl_data_ack_reason": 0})
+    mock_post.return_value = mock_response
+
+    command = '{"sl_client_id":"test_client_id","sl_cmd":"sl_users_list_req"}'
+    response = await auth_instance.async_send_raw(command)
+
+    assert response == {"sl_data_ack_reason": 0}
+    assert auth_instance.cseq == 0
+    mock_post.assert_called_once_with(
+        URL("http://192.168.x.x/domo/"),
+        data=urlencode({"command": command}).encode(),
+        headers=Auth._DEFAULT_HTTP_HEADERS,  # pylint: disable=protected-access
+        timeout=ClientTimeout(total=10),
+    )
+
+
+async def test_async_send_command_reuses_connection():
+    # Real HTTP round-trips against a local server, checking that consecutive
+    # commands go over the same keep-alive connection instead of opening new ones
+    peers = []
+
+    async def handler(request: web.Request) -> web.Response:
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response({"sl_data_ack_reason": 0})
+
+    app = web.Application()
+    app.router.add_post("/domo/", handler)
+    async with TestServer(app) as server, Auth.create_websession() as session:
+        auth = Auth(session, f"{server.host}:{server.port}", "user", "password")
+        for _ in range(3):
+            await auth.async_send_command({"sl_cmd": "sl_keep_alive_req"})
+
+    assert len(peers) == 3
+    assert len(set(peers)) == 1, "All the commands should share one connection"
+
+
+@patch.object(ClientSession, "post", new_callable=AsyncMock)
+@patch.object(Auth, "_now", return_value=1000.0)
+async def test_async_send_command_bad_ack(
+    mock_now, mock_post, auth_instance  # pylint: disable=unused-argument
+):
+    mock_response = mock_json_response({"sl_data_ack_reason": 1})
     mock_post.return_value = mock_response
 
     auth_instance.keep_alive_timeout_sec = 900
 
     payload = {"command": "test_command"}
-    with pytest.raises(CameDomoticServerError):
+    with pytest.raises(CameDomoticServerError, match="Bad ack code"):
         await auth_instance.async_send_command(payload)
 
-    assert auth_instance.cseq == 1
+    assert auth_instance.cseq == 0
     assert (
         auth_instance.session_expiration_timestamp
-        == time.monotonic() + auth_instance.keep_alive_timeout_sec - 30
+        == 1000.0 + auth_instance.keep_alive_timeout_sec - 30
     )
     mock_post.assert_called_once_with(
-        "http://192.168.x.x/domo/",
-        data={"command": json.dumps(payload)},
+        URL("http://192.168.x.x/domo/"),
+        data=urlencode({"command": json_dumps(payload)}).encode(),
         headers=Auth._DEFAULT_HTTP_HEADERS,  # pylint: disable=protected-access
-        timeout=10,
+        timeout=ClientTimeout(total=10),
     )
 
 
+@patch.object(ClientSession, "post", new_callable=AsyncMock)
+async def test_async_send_raw_bad_ack_is_logged(mock_post, auth_instance, caplog):
+    mock_post.return_value = mock_json_response({"sl_data_ack_reason": 1})
+    command = build_data_req("test_client_id", "light_list_req", 1)
+
+    with pytest.raises(CameDomoticServerError):
+        await auth_instance.async_send_raw(command)
+
+    assert "Error sending command 'light_list_req': Bad ack code (1)" in caplog.text
+
+
+@patch.object(ClientSession, "post", new_callable=AsyncMock)
+async def test_async_send_command_failure_is_logged(mock_post, auth_instance, caplog):
+    mock_post.side_effect = RuntimeError("boom")
+
+    with pytest.raises(CameDomoticServerError):
+        await auth_instance.async_send_command({"sl_cmd": "sl_keep_alive_req"})
+
+    # Logged once, with the traceback, even if the send goes through two decorators
+    errors = [r for r in caplog.records if r.levelname == "ERROR"]
+    assert len(errors) == 1
+    assert "Unexpected error in 'async_send_raw': boom" in errors[0].getMessage()
+    assert errors[0].exc_info is not None
+
+
 @patch.object(ClientSession, "post", new_callable=AsyncMock)
 async def test_async_send_command_failure(mock_post, auth_instance):
     mock_post.side_effect = Exception()
@@ -210,10 +364,10 @@ async def test_async_send_command_failure(mock_post, auth_instance):
         await auth_instance.async_send_command(payload)
 
     mock_post.assert_called_once_with(
-        "http://192.168.x.x/domo/",
-        data={"command": json.dumps(payload)},
+        URL("http://192.168.x.x/domo/"),
+        data=urlencode({"command": json_dumps(payload)}).encode(),
         headers=Auth._DEFAULT_HTTP_HEADERS,  # pylint: disable=protected-access
-        timeout=10,
+        timeout=ClientTimeout(total=10),
     )
 
 
@@ -226,10 +380,10 @@ async def test_async_send_command_timeout(mock_post, auth_instance):
         await auth_instance.async_send_command(payload)
 
     mock_post.assert_called_once_with(
-        "http://192.168.x.x/domo/",
-        data={"command": json.dumps(payload)},
+        URL("http://192.168.x.x/domo/"),
+        data=urlencode({"command": json_dumps(payload)}).encode(),
         headers=Auth._DEFAULT_HTTP_HEADERS,  # pylint: disable=protected-access
-        timeout=10,
+        timeout=ClientTimeout(total=10),
     )
 
 
@@ -255,10 +409,10 @@ async def test_async_send_command_non_2xx_status(
         await auth_instance.async_send_command(payload)
 
     mock_post.assert_called_once_with(
-        "http://192.168.x.x/domo/",
-        data={"command": json.dumps(payload)},
+        URL("http://192.168.x.x/domo/"),
+        data=urlencode({"command": json_dumps(payload)}).encode(),
         headers=Auth._DEFAULT_HTTP_HEADERS,  # pylint: disable=protected-access
-        timeout=10,
+        timeout=ClientTimeout(total=10),
     )
     mock_raise_for_status_and_ack.assert_called_once()
     assert auth_instance.cseq == 0
@@ -268,53 +422,49 @@ async def test_async_send_command_non_2xx_status(
     )
 
 
-async def test_validate_host_success(auth_instance):
-    with patch("aiohttp.ClientSession.get") as mock_get:
-        # Setup mock response with status code 200 for aiohttp.ClientSession.get method
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_get.return_value.__aenter__.return_value = mock_response
-
-        await auth_instance.async_validate_host()
-        mock_get.assert_called_once_with(auth_instance.get_endpoint_url(), timeout=10)
-
-
-async def test_validate_host_failure_status_code(auth_instance):
+@pytest.mark.parametrize(
+    "status, side_effect, expected_exception",
+    [
+        (200, None, None),
+        (404, None, CameDomoticServerNotFoundError),
+        (200, aiohttp.ClientError(), CameDomoticServerNotFoundError),
+    ],
+    ids=["success", "failure_status_code", "failure_exception"],
+)
+async def test_validate_host(auth_instance, status, side_effect, expected_exception):
     with patch("aiohttp.ClientSession.get") as mock_get:
         mock_response = Mock()
-        mock_response.status = 404
+        mock_response.status = status
         mock_get.return_value.__aenter__.return_value = mock_response
+        mock_get.side_effect = side_effect
 
-        with pytest.raises(CameDomoticServerNotFoundError):
-            await auth_instance.async_validate_host()
-
-        mock_get.assert_called_once_with(auth_instance.get_endpoint_url(), timeout=10)
-
-
-async def test_validate_host_failure_exception(auth_instance):
-    with patch("aiohttp.ClientSession.get") as mock_get:
-        mock_get.side_effect = aiohttp.ClientError()
-
-        with pytest.raises(CameDomoticServerNotFoundError):
+        if expected_exception is None:
             await auth_instance.async_validate_host()
+        else:
+            with pytest.raises(expected_exception):
+                await auth_instance.async_validate_host()
 
-        mock_get.assert_called_once_with(auth_instance.get_endpoint_url(), timeout=10)
+        mock_get.assert_called_once_with(
+            auth_instance.get_endpoint_url(), timeout=ClientTimeout(total=10)
+        )
 
 
-@freezegun.freeze_time("2020-01-01")
-async def test_async_login_success(auth_instance_not_logged_in: Auth):
+@patch.object(Auth, "_now", return_value=1000.0)
+async def test_async_login_success(
+    mock_now, auth_instance_not_logged_in: Auth  # pylint: disable=unused-argument
+):
     with patch.object(
         Auth, "async_send_command", new_callable=AsyncMock
     ) as mock_send_command, patch.object(
         Auth, "validate_session", return_value=False
     ) as mock_validate_session:
-        # Setup mock response with async json method returning the desired dictionary
-        mock_response = AsyncMock()
-        mock_response.json.return_value = {
-            "sl_data_ack_reason": 0,
-            "sl_client_id": "test_client_id",
-            "sl_keep_alive_timeout_sec": 900,
-        }
+        mock_response = mock_json_response(
+            {
+                "sl_data_ack_reason": 0,
+                "sl_client_id": "test_client_id",
+                "sl_keep_alive_timeout_sec": 900,
+            }
+        )
         mock_send_command.return_value = mock_response
 
         await auth_instance_not_logged_in.async_login()
@@ -336,18 +486,17 @@ async def test_async_login_success(auth_instance_not_logged_in: Auth):
         assert auth_instance_not_logged_in.keep_alive_timeout_sec == 900
         assert (
             auth_instance_not_logged_in.session_expiration_timestamp
-            == time.monotonic() + 900 - 30
+            == 1000.0 + 900 - 30
         )
 
 
-@freezegun.freeze_time("2020-01-01")
 async def test_async_login_already_authenticated(auth_instance: Auth):
     with patch.object(
         Auth, "validate_session", return_value=True
     ) as mock_validate_session, patch.object(
         Auth, "async_send_command", new_callable=AsyncMock
     ) as mock_send_command, patch.object(
-        Auth, "async_keep_alive", new_callable=AsyncMock
+        Auth, "_async_perform_keep_alive", new_callable=AsyncMock
     ) as mock_keep_alive:
         await auth_instance.async_login()
         mock_validate_session.assert_called_once()
@@ -369,37 +518,41 @@ async def test_async_login_send_command_failure(
             await auth_instance_not_logged_in.async_login()
 
 
+@pytest.mark.parametrize(
+    "ack_reason, message",
+    [
+        # The known codes come from the same table used by Auth
+        *((code, re.escape(msg)) for code, msg in _LOGIN_ACK_ERROR_MESSAGES.items()),
+        (7, r"Authentication failed \(ACK error: 7\)"),
+    ],
+)
+@patch.object(ClientSession, "post", new_callable=AsyncMock)
+@patch.object(Auth, "validate_session", return_value=None)
 async def test_async_login_bad_ack(
+    mock_validate_session,
+    mock_send_command,
+    ack_reason,
+    message,
     auth_instance_not_logged_in: Auth,
 ):
-    with patch.object(
-        ClientSession, "post", new_callable=AsyncMock
-    ) as mock_send_command, patch.object(
-        Auth, "validate_session", return_value=None
-    ) as mock_validate_session:
-        # Setup mock response with async json method returning the desired dictionary
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json.return_value = {
-            "sl_data_ack_reason": 1,
+    mock_send_command.return_value = mock_json_response(
+        {
+            "sl_data_ack_reason": ack_reason,
             "sl_client_id": "bad_client_id",
             "sl_keep_alive_timeout_sec": 900,
         }
-        mock_send_command.return_value = mock_response
+    )
 
-        mock_validate_session.assert_not_called()
-        with pytest.raises(CameDomoticAuthError):
-            await auth_instance_not_logged_in.async_login()
+    with pytest.raises(CameDomoticAuthError, match=message):
+        await auth_instance_not_logged_in.async_login()
+    mock_validate_session.assert_called_once()
 
 
 async def test_async_login_json_decode_error(auth_instance_not_logged_in: Auth):
     with patch.object(
         ClientSession, "post", new_callable=AsyncMock
     ) as mock_send_command:
-        # Setup mock response with async json method returning the desired dictionary
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json.side_effect = json.JSONDecodeError("Error", "", 0)
+        mock_response = mock_json_response(b"not a JSON document")
         mock_send_command.return_value = mock_response
 
         with pytest.raises(CameDomoticAuthError):
@@ -436,8 +589,22 @@ async def test_async_keep_alive_valid_session_unsuccessful_keep_alive(
     )
 
 
+@patch.object(ClientSession, "post", new_callable=AsyncMock)
+@patch.object(Auth, "validate_session", return_value=True)
+async def test_async_keep_alive_bad_ack(
+    mock_validate_session,  # pylint: disable=unused-argument
+    mock_post,
+    auth_instance,
+):
+    # An expired or unknown client ID is reported with a bad ACK code
+    mock_post.return_value = mock_json_response({"sl_data_ack_reason": 3})
+
+    with pytest.raises(CameDomoticServerError, match="Bad ack code"):
+        await auth_instance.async_keep_alive()
+
+
 @patch.object(Auth, "validate_session", return_value=False)
-@patch.object(Auth, "async_login", new_callable=AsyncMock)
+@patch.object(Auth, "_async_perform_login", new_callable=AsyncMock)
 async def test_async_keep_alive_invalid_session_successful_login(
     mock_login, mock_validate_session, auth_instance
 ):
@@ -448,7 +615,10 @@ async def test_async_keep_alive_invalid_session_successful_login(
 
 @patch.object(Auth, "validate_session", return_value=False)
 @patch.object(
-    Auth, "async_login", new_callable=AsyncMock, side_effect=CameDomoticAuthError
+    Auth,
+    "_async_perform_login",
+    new_callable=AsyncMock,
+    side_effect=CameDomoticAuthError,
 )
 async def test_async_keep_alive_invalid_session_unsuccessful_login(
     mock_login, mock_validate_session, auth_instance
@@ -506,6 +676,8 @@ async def test_async_logout_send_command_failure(
 async def test_async_dispose_valid_session_successful_logout(
     mock_logout, mock_validate_session, mock_close, auth_instance
 ):
+    # Closing is mocked, and the fixture restores the flag before its teardown
+    auth_instance.close_websession_on_disposal = True
     await auth_instance.async_dispose()
     mock_validate_session.assert_called_once()
     mock_logout.assert_called_once()
@@ -520,6 +692,8 @@ async def test_async_dispose_valid_session_successful_logout(
 async def test_async_dispose_valid_session_unsuccessful_logout(
     mock_logout, mock_validate_session, mock_close, auth_instance
 ):
+    # Closing is mocked, and the fixture restores the flag before its teardown
+    auth_instance.close_websession_on_disposal = True
     await auth_instance.async_dispose()
     mock_validate_session.assert_called_once()
     mock_logout.assert_called_once()
@@ -532,6 +706,8 @@ async def test_async_dispose_valid_session_unsuccessful_logout(
 async def test_async_dispose_invalid_session(
     mock_logout, mock_validate_session, mock_close, auth_instance
 ):
+    # Closing is mocked, and the fixture restores the flag before its teardown
+    auth_instance.close_websession_on_disposal = True
     await auth_instance.async_dispose()
     mock_validate_session.assert_called_once()
     mock_logout.assert_not_called()
@@ -539,65 +715,270 @@ async def test_async_dispose_invalid_session(
 
 
 @patch.object(ClientSession, "close", new_callable=AsyncMock)
-async def test_async_dispose_no_websession_close(mock_close, auth_instance):
+@patch.object(Auth, "async_logout", new_callable=AsyncMock)
+async def test_async_dispose_no_websession_close(
+    mock_logout, mock_close, auth_instance
+):
     auth_instance.close_websession_on_disposal = False
     await auth_instance.async_dispose()
+    mock_logout.assert_called_once()
     mock_close.assert_not_called()
 
 
-@freezegun.freeze_time("2022-01-01 12:00:00")
 def test_validate_session_valid(auth_instance):
     # Set the session expiration timestamp to a future date
-    auth_instance.session_expiration_timestamp = time.monotonic() + 900
+    auth_instance.session_expiration_timestamp = Auth._now() + 900
     auth_instance.client_id = "test_client_id"
     assert auth_instance.validate_session() is True
 
 
-@freezegun.freeze_time("2022-01-01 12:00:00")
 def test_validate_session_expired(auth_instance):
     # Set the session expiration timestamp to a past date
-    auth_instance.session_expiration_timestamp = time.monotonic() - 3600
+    auth_instance.session_expiration_timestamp = Auth._now() - 3600
     assert auth_instance.validate_session() is False
 
 
 async def test_concurrent_logins(auth_instance):
-    with patch.object(
-        Auth, "async_send_command", new_callable=AsyncMock
-    ) as mock_send_command:  # pylint: disable=unused-variable  # noqa: F841
-        # Mock validate_session to initially return False, indicating session is invalid
-        auth_instance.validate_session = Mock(side_effect=[False] * 10)
-
-        # Mock the async_login so it actually changes the validate_session to return
-        # True afterwards
-        async def login_side_effect():
-            auth_instance.validate_session = Mock(return_value=True)
-
-        auth_instance.async_login = AsyncMock(side_effect=login_side_effect)
-
+    # Auth uses __slots__, so the methods are mocked on the class
+    session = {"valid": False}
+
+    # Mock the login so it actually changes the validate_session to return
+    # True afterwards
+    async def login_side_effect():
+        session["valid"] = True
+
+    with patch.object(Auth, "async_send_command", new_callable=AsyncMock), patch.object(
+        Auth, "validate_session", side_effect=lambda: session["valid"]
+    ), patch.object(
+        Auth, "_async_perform_login", side_effect=login_side_effect
+    ) as mock_login:
         # Simulate concurrent login attempts
-        await asyncio.gather(*(auth_instance.async_keep_alive() for _ in range(10)))
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(10):
+                tg.create_task(auth_instance.async_keep_alive())
 
         # Check that login was initiated and is now valid
         assert (
             auth_instance.validate_session()
         ), "Session should be valid after concurrent logins"
-        assert (
-            auth_instance.async_login.call_count == 1
-        ), "Login should be called exactly once"
+        assert mock_login.call_count == 1, "Login should be called exactly once"
 
 
 @pytest.mark.asyncio
-async def test_no_deadlocks_under_load(auth_instance):
-    auth_instance.validate_session = AsyncMock(return_value=True)
-    auth_instance.async_login = AsyncMock()
-    auth_instance.async_send_command = AsyncMock()
-
-    # Semaphore to simulate load and a small delay in each operation
-    async with asyncio.Semaphore(10):  # Limit concurrency to 10
-        tasks = [
-            asyncio.create_task(auth_instance.async_keep_alive()) for _ in range(100)
-        ]  # 100 concurrent requests
-        await asyncio.gather(*tasks)  # Wait for all tasks to complete
+@patch.object(Auth, "validate_session", return_value=True)
+@patch.object(Auth, "async_login", new_callable=AsyncMock)
+@patch.object(Auth, "async_send_command", new_callable=AsyncMock)
+async def test_no_deadlocks_under_load(
+    mock_send_command,  # pylint: disable=unused-argument
+    mock_login,  # pylint: disable=unused-argument
+    mock_validate_session,  # pylint: disable=unused-argument
+    auth_instance,
+):
+    # 100 concurrent requests, the task group waits for all of them to complete
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(auth_instance.async_keep_alive()) for _ in range(100)]
 
     # Check if all tasks completed successfully without deadlocking
     assert all(task.done() for task in tasks), "All tasks should complete successfully"
+
+
+def test_reserve_cseq(auth_instance):
+    auth_instance.cseq = 5
+    assert auth_instance.reserve_cseq(3) == 6
+    assert auth_instance.cseq == 8
+    assert auth_instance.reserve_cseq() == 9
+    assert auth_instance.cseq == 9
+
+
+def test_auth_has_no_instance_dict(auth_instance):
+    assert not hasattr(auth_instance, "__dict__")
+    with pytest.raises(AttributeError):
+        auth_instance.unknown_attribute = 1
+    # Still weak-referenceable, e.g. for finalizers
+    assert weakref.ref(auth_instance)() is auth_instance
+
+
+async def test_get_credentials_is_not_cached(auth_instance_not_logged_in: Auth):
+    auth = auth_instance_not_logged_in
+    with patch.object(
+        auth, "cipher_suite", wraps=auth.cipher_suite
+    ) as mock_cipher_suite:
+        assert await auth._async_get_credentials() == ("username", "password")
+        assert await auth._async_get_credentials() == ("username", "password")
+        # Decrypted on every call, the clear text is never kept in the instance
+        assert mock_cipher_suite.decrypt.call_count == 4
+
+
+async def test_update_auth_credentials_replaces_credentials(
+    auth_instance: Auth,
+):
+    assert await auth_instance._async_get_credentials() == ("username", "password")
+
+    auth_instance.update_auth_credentials("new_user", "new_password")
+
+    assert await auth_instance._async_get_credentials() == (
+        "new_user",
+        "new_password",
+    )
+    assert auth_instance.client_id == ""
+    assert auth_instance.validate_session() is False
+
+
+async def test_async_update_auth_credentials(auth_instance: Auth):
+    with patch("asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread:
+        await auth_instance.async_update_auth_credentials("new_user", "new_password")
+        mock_to_thread.assert_called_once()
+
+    assert auth_instance.cipher_suite.decrypt(auth_instance.username) == b"new_user"
+    assert auth_instance.cipher_suite.decrypt(auth_instance.password) == b"new_password"
+    assert auth_instance.client_id == ""
+    assert auth_instance.validate_session() is False
+
+
+async def test_restore_auth_credentials_restores_credentials(
+    auth_instance: Auth,
+):
+    backup = auth_instance.backup_auth_credentials()
+    auth_instance.update_auth_credentials("new_user", "new_password")
+    assert await auth_instance._async_get_credentials() == (
+        "new_user",
+        "new_password",
+    )
+
+    auth_instance.restore_auth_credentials(backup)
+
+    assert await auth_instance._async_get_credentials() == ("username", "password")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_dumps_loads(use_orjson):
+    payload = {"sl_appl_msg": {"client": "my_client_id", "cseq": 1}, "sl_login": "àè"}
+    with patch(
+        "aiocamedomotic.auth.orjson",
+        aiocamedomotic.auth.orjson if use_orjson else None,
+    ):
+        command = json_dumps(payload)
+        # Non-ASCII characters are not escaped, whichever the serializer
+        assert command == (
+            '{"sl_appl_msg":{"client":"my_client_id","cseq":1},"sl_login":"àè"}'
+        )
+        assert json_loads(command.encode()) == payload
+
+        with pytest.raises(json.JSONDecodeError):
+            json_loads(b"not a JSON document")
+
+
+async def test_now_uses_monotonic_clock():
+    assert Auth._now is time.monotonic
+    # The same clock inside and outside of the event loop
+    in_thread = await asyncio.to_thread(Auth._now)
+    assert in_thread <= Auth._now()
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        '{"sl_client_id":"test_client_id","sl_cmd":"sl_users_list_req"}',
+        json_dumps({"sl_login": "user name", "sl_pwd": "p&ss=w+rd/è"}),
+    ],
+)
+def test_encode_command_form(command):
+    # Same body aiohttp would build from data={"command": command}
+    assert encode_command_form(command) == urlencode({"command": command}).encode()
+
+
+@patch.object(aiocamedomotic.auth.asyncio, "sleep", new_callable=AsyncMock)
+@patch.object(ClientSession, "post", new_callable=AsyncMock)
+async def test_async_send_command_retries_dropped_connection(
+    mock_post, mock_sleep, auth_instance
+):
+    mock_response = mock_json_response({"sl_data_ack_reason": 0})
+    mock_post.side_effect = [aiohttp.ServerDisconnectedError(), mock_response]
+
+    response = await auth_instance.async_send_command({"command": "test_command"})
+
+    assert response == {"sl_data_ack_reason": 0}
+    assert mock_post.call_count == 2
+    mock_sleep.assert_awaited_once()
+    assert auth_instance.cseq == 0
+
+
+@patch.object(aiocamedomotic.auth.asyncio, "sleep", new_callable=AsyncMock)
+@patch.object(ClientSession, "post", new_callable=AsyncMock)
+async def test_async_send_command_gives_up_after_retries(
+    mock_post, mock_sleep, auth_instance
+):
+    mock_post.side_effect = aiohttp.ClientOSError()
+
+    with pytest.raises(CameDomoticServerError, match="connection error"):
+        await auth_instance.async_send_command({"command": "test_command"})
+
+    # First attempt plus the retries, with a growing delay between them
+    assert mock_post.call_count == 3
+    delays = [c.args[0] for c in mock_sleep.await_args_list]
+    assert len(delays) == 2
+    assert 0.1 <= delays[0] < 0.15
+    assert 0.2 <= delays[1] < 0.25
+
+
+@patch.object(aiocamedomotic.auth.asyncio, "sleep", new_callable=AsyncMock)
+@patch.object(ClientSession, "post", new_callable=AsyncMock)
+async def test_async_send_command_connection_refused_not_retried(
+    mock_post, mock_sleep, auth_instance
+):
+    mock_post.side_effect = aiohttp.ClientConnectorError(
+        Mock(), OSError("Connection refused")
+    )
+
+    with pytest.raises(CameDomoticServerError, match="connection error"):
+        await auth_instance.async_send_command({"command": "test_command"})
+
+    mock_post.assert_called_once()
+    mock_sleep.assert_not_called()
+
+
+def test_get_client_timeout():
+    default_timeout = Auth._get_client_timeout(10)
+    assert default_timeout == ClientTimeout(total=10)
+    # The default timeout is built only once
+    assert Auth._get_client_timeout(10) is default_timeout
+    assert Auth._get_client_timeout(30) == ClientTimeout(total=30)
+    assert Auth._get_client_timeout(None) == ClientTimeout(total=None)
+
+
+async def test_async_raise_for_status_and_ack_invalid_json():
+    response = mock_json_response(b"not json")
+
+    with pytest.raises(CameDomoticServerError, match="decoding"):
+        await Auth.async_raise_for_status_and_ack(response)
+
+
+@pytest.mark.parametrize("ack_reason", [None, 0])
+def test_check_ack_success(ack_reason):
+    resp_json = {"sl_data_ack_reason": ack_reason}
+    assert Auth._check_ack(resp_json) is resp_json
+
+
+@pytest.mark.parametrize("ack_reason", [1, 3, 4, 5, 6, 7, 8, 9])
+def test_check_ack_bad_ack(ack_reason):
+    with pytest.raises(CameDomoticServerError, match=rf"Bad ack code \({ack_reason}\)"):
+        Auth._check_ack({"sl_data_ack_reason": ack_reason})
+
+
+@pytest.mark.parametrize(
+    "extra, expected_extra",
+    [("", {}), (',"act_id":1,"perc":50', {"act_id": 1, "perc": 50})],
+)
+def test_build_data_req(extra, expected_extra):
+    command = build_data_req("test_client_id", "light_switch_req", 3, extra)
+    assert json_loads(command) == {
+        "sl_appl_msg": {
+            "client": "test_client_id",
+            "cmd_name": "light_switch_req",
+            "cseq": 3,
+            **expected_extra,
+        },
+        "sl_appl_msg_type": "domo",
+        "sl_client_id": "test_client_id",
+        "sl_cmd": "sl_data_req",
+    }
@@ -15,9 +15,16 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-function-docstring
 # pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
 # flake8: noqa: F811
 
-from unittest.mock import AsyncMock, patch
+import asyncio
+import json
+import weakref
+from unittest.mock import AsyncMock, patch, sentinel
+from urllib.parse import parse_qs
+
+from aiohttp import ClientSession
 import pytest
 
 # from .mocked_responses import SL_USERS_LIST_RESP
@@ -26,22 +33,123 @@ from aiocamedomotic.models import (
     ServerInfo,
     User,
     Light,
+    LightStatus,
+    LightType,
+    UpdateList,
 )
 from aiocamedomotic.errors import (
+    CameDomoticServerError,
     CameDomoticServerNotFoundError,
     CameDomoticError,
 )
 
 
 from tests.aiocamedomotic.const import (
+    mock_json_response,
     auth_instance,  # noqa: F401
     auth_instance_not_logged_in,  # noqa: F401
 )
 
+# Canned server responses, shared by the tests that only read them
+_USERS_PAYLOAD = {
+    "sl_cmd": "sl_users_list_resp",
+    "sl_data_ack_reason": 0,
+    "sl_client_id": "75c6c33a",
+    "sl_users_list": [{"name": "admin"}, {"name": "user"}],
+}
+
+_SERVER_INFO_PAYLOAD = {
+    "cmd_name": "feature_list_resp",
+    "cseq": 1,
+    "keycode": "0000FFFF9999AAAA",
+    "swver": "1.2.3",
+    "type": "0",
+    "board": "3",
+    "serial": "0011ffee",
+    "list": [
+        "lights",
+        "openings",
+        "thermoregulation",
+        "scenarios",
+        "digitalin",
+        "energy",
+        "loadsctrl",
+    ],
+    "recovery_status": 0,
+    "sl_data_ack_reason": 0,
+}
+
+_LIGHTS_PAYLOAD = {
+    "array": [
+        {
+            "act_id": 1,
+            "floor_ind": 19,
+            "name": "light_ChQQs",
+            "room_ind": 23,
+            "status": 1,
+            "type": "STEP_STEP",
+        },
+        {
+            "act_id": 2,
+            "floor_ind": 19,
+            "name": "light_vdAEA",
+            "room_ind": 23,
+            "status": 1,
+            "type": "STEP_STEP",
+        },
+        {
+            "act_id": 3,
+            "floor_ind": 19,
+            "name": "light_onbFB",
+            "room_ind": 23,
+            "status": 0,
+            "type": "STEP_STEP",
+        },
+        {
+            "act_id": 4,
+            "floor_ind": 19,
+            "name": "light_xoOyy",
+            "perc": 52,
+            "room_ind": 23,
+            "status": 0,
+            "type": "DIMMER",
+        },
+        {
+            "act_id": 5,
+            "floor_ind": 19,
+            "name": "light_epChT",
+            "room_ind": 23,
+            "status": 0,
+            "type": "STEP_STEP",
+        },
+        {
+            "act_id": 6,
+            "floor_ind": 19,
+            "name": "light_DVyyO",
+            "room_ind": 23,
+            "status": 0,
+            "type": "STEP_STEP",
+        },
+        {
+            "act_id": 7,
+            "floor_ind": 19,
+            "name": "light_XeXgB",
+            "perc": 14,
+            "room_ind": 29,
+            "status": 0,
+            "type": "DIMMER",
+        },
+    ],
+    "cmd_name": "light_list_resp",
+    "cseq": 1,
+    "sl_data_ack_reason": 0,
+}
+
 
 async def test_init(auth_instance):
     api = CameDomoticAPI(auth_instance)
     assert api.auth == auth_instance
+    assert weakref.ref(api)() is api
 
 
 @patch.object(Auth, "async_dispose")
@@ -78,6 +186,14 @@ async def test_async_dispose_no_exceptions(mock_async_dispose, auth_instance):
         pytest.fail(f"async_dispose raised an exception: {e}")
 
 
+@patch.object(Auth, "async_dispose")
+async def test_async_dispose_unexpected_exception(mock_async_dispose, auth_instance):
+    mock_async_dispose.side_effect = RuntimeError("unexpected")
+    api = CameDomoticAPI(auth_instance)
+    with pytest.raises(RuntimeError, match="unexpected"):
+        await api.async_dispose()
+
+
 @patch.object(Auth, "async_dispose")
 async def test_context_manager(mock_async_dispose, auth_instance):
     async with CameDomoticAPI(auth_instance):
@@ -98,8 +214,9 @@ async def test_context_manager_no_exceptions(mock_async_dispose, auth_instance):
 
 @patch.object(Auth, "async_create")
 async def test_async_create_all_params(mock_async_create):
-    mock_auth = AsyncMock()
-    mock_session = AsyncMock()
+    # The objects are only passed through, plain sentinels are enough
+    mock_auth = sentinel.auth
+    mock_session = sentinel.websession
     mock_async_create.return_value = mock_auth
 
     api = await CameDomoticAPI.async_create(
@@ -108,27 +225,37 @@ async def test_async_create_all_params(mock_async_create):
         "password",
         websession=mock_session,
         close_websession_on_disposal=True,
+        validate_host=False,
     )
 
     mock_async_create.assert_called_once_with(
-        mock_session, "host", "username", "password", close_websession_on_disposal=True
+        mock_session,
+        "host",
+        "username",
+        "password",
+        close_websession_on_disposal=True,
+        validate_host=False,
     )
     assert api.auth == mock_auth
 
 
-@patch("aiohttp.ClientSession")
+@patch.object(Auth, "create_websession")
 @patch.object(Auth, "async_create")
-async def test_async_create_default_params(
-    mock_async_create, mock_session  # pylint: disable=unused-argument
-):
-    mock_auth = AsyncMock()
+async def test_async_create_default_params(mock_async_create, mock_create_websession):
+    mock_auth = sentinel.auth
     mock_async_create.return_value = mock_auth
 
-    # Define an AsyncMock
-
     api = await CameDomoticAPI.async_create("host", "username", "password")
 
-    mock_async_create.assert_called_once()
+    mock_create_websession.assert_called_once_with()
+    mock_async_create.assert_called_once_with(
+        mock_create_websession.return_value,
+        "host",
+        "username",
+        "password",
+        close_websession_on_disposal=True,
+        validate_host=True,
+    )
     assert api.auth == mock_auth
 
 
@@ -140,15 +267,10 @@ async def test_async_create_exception(mock_async_create):
         await CameDomoticAPI.async_create("host", "username", "password")
 
 
-@patch.object(Auth, "async_send_command", return_value=AsyncMock())
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
 async def test_async_get_users(mock_send_command, auth_instance):
     api = CameDomoticAPI(auth_instance)
-    mock_send_command.return_value.json.return_value = {
-        "sl_cmd": "sl_users_list_resp",
-        "sl_data_ack_reason": 0,
-        "sl_client_id": "75c6c33a",
-        "sl_users_list": [{"name": "admin"}, {"name": "user"}],
-    }
+    mock_send_command.return_value = _USERS_PAYLOAD
 
     users = await api.async_get_users()
     assert len(users) == 2
@@ -157,31 +279,18 @@ async def test_async_get_users(mock_send_command, auth_instance):
     assert users[0].name == "admin"
     assert users[1].name == "user"
 
+    mock_send_command.assert_called_once()
+    assert json.loads(mock_send_command.call_args.args[0]) == {
+        "sl_client_id": "test_client_id",
+        "sl_cmd": "sl_users_list_req",
+    }
+
 
 # Test for async_get_server_info method
-@patch.object(Auth, "async_send_command", return_value=AsyncMock())
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
 async def test_async_get_server_info(mock_send_command, auth_instance):
     api = CameDomoticAPI(auth_instance)
-    mock_send_command.return_value.json.return_value = {
-        "cmd_name": "feature_list_resp",
-        "cseq": 1,
-        "keycode": "0000FFFF9999AAAA",
-        "swver": "1.2.3",
-        "type": "0",
-        "board": "3",
-        "serial": "0011ffee",
-        "list": [
-            "lights",
-            "openings",
-            "thermoregulation",
-            "scenarios",
-            "digitalin",
-            "energy",
-            "loadsctrl",
-        ],
-        "recovery_status": 0,
-        "sl_data_ack_reason": 0,
-    }
+    mock_send_command.return_value = _SERVER_INFO_PAYLOAD
 
     server_info = await api.async_get_server_info()
     assert isinstance(server_info, ServerInfo)
@@ -196,78 +305,394 @@ async def test_async_get_server_info(mock_send_command, auth_instance):
     assert features[0] == "lights"
     assert features[1] == "openings"
 
+    mock_send_command.assert_called_once()
+    assert json.loads(mock_send_command.call_args.args[0]) == {
+        "sl_appl_msg": {
+            "client": "test_client_id",
+            "cmd_name": "feature_list_req",
+            "cseq": 1,
+        },
+        "sl_appl_msg_type": "domo",
+        "sl_client_id": "test_client_id",
+        "sl_cmd": "sl_data_req",
+    }
+
 
 # Test for async_get_lights method
-@patch.object(Auth, "async_send_command", return_value=AsyncMock())
-async def test_async_get_lights(mock_send_command, auth_instance):
+# (1 and 2 lights are all STEP_STEP, the full list mixes in DIMMER lights)
+@pytest.mark.parametrize("n_lights", [1, 2, 7])
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
+async def test_async_get_lights(mock_send_command, n_lights, auth_instance):
+    api = CameDomoticAPI(auth_instance)
+    items = _LIGHTS_PAYLOAD["array"][:n_lights]
+    mock_send_command.return_value = {**_LIGHTS_PAYLOAD, "array": items}
+
+    lights = await api.async_get_lights()
+    assert len(lights) == n_lights
+    assert all(isinstance(light, Light) for light in lights)
+    assert [light.act_id for light in lights] == [item["act_id"] for item in items]
+    assert [light.type for light in lights] == [
+        LightType(item["type"]) for item in items
+    ]
+
+    mock_send_command.assert_called_once()
+    assert json.loads(mock_send_command.call_args.args[0]) == {
+        "sl_appl_msg": {
+            "client": "test_client_id",
+            "cmd_name": "light_list_req",
+            "cseq": 1,
+            "topologic_scope": "plant",
+            "value": 0,
+        },
+        "sl_appl_msg_type": "domo",
+        "sl_client_id": "test_client_id",
+        "sl_cmd": "sl_data_req",
+    }
+
+
+# Test for async_get_updates method
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
+async def test_async_get_updates(mock_send_command, auth_instance):
+    api = CameDomoticAPI(auth_instance)
+    mock_send_command.return_value = {
+        "cmd_name": "status_update_resp",
+        "cseq": 1,
+        "result": [{"cmd_name": "light_update_ind", "act_id": 1, "status": 1}],
+        "sl_data_ack_reason": 0,
+    }
+
+    updates = await api.async_get_updates()
+    assert isinstance(updates, UpdateList)
+    assert len(updates) == 1
+    assert updates[0]["act_id"] == 1
+
+    mock_send_command.assert_called_once()
+    assert json.loads(mock_send_command.call_args.args[0]) == {
+        "sl_appl_msg": {
+            "client": "test_client_id",
+            "cmd_name": "status_update_req",
+            "cseq": 1,
+        },
+        "sl_appl_msg_type": "domo",
+        "sl_client_id": "test_client_id",
+        "sl_cmd": "sl_data_req",
+    }
+
+
+async def test_async_refresh_all(auth_instance):
+    api = CameDomoticAPI(auth_instance)
+    responses = {
+        "feature_list_req": {
+            "keycode": "0000FFFF9999AAAA",
+            "swver": "1.2.3",
+            "type": "0",
+            "board": "3",
+            "serial": "0011ffee",
+            "list": ["lights"],
+            "sl_data_ack_reason": 0,
+        },
+        "light_list_req": {
+            "array": [{"act_id": 1, "name": "light_ChQQs", "type": "STEP_STEP"}],
+            "sl_data_ack_reason": 0,
+        },
+        "status_update_req": {
+            "result": [{"cmd_name": "light_update_ind", "act_id": 1}],
+            "sl_data_ack_reason": 0,
+        },
+    }
+
+    async def send_raw_side_effect(command):
+        return responses[json.loads(command)["sl_appl_msg"]["cmd_name"]]
+
+    with patch.object(
+        Auth, "async_send_raw", side_effect=send_raw_side_effect
+    ) as mock_send_raw:
+        server_info, lights, updates = await api.async_refresh_all()
+
+    assert server_info.keycode == "0000FFFF9999AAAA"
+    assert [light.act_id for light in lights] == [1]
+    assert isinstance(updates, UpdateList)
+    assert len(updates) == 1
+
+    # Each concurrent request got its own sequence number
+    sent = [json.loads(c.args[0])["sl_appl_msg"] for c in mock_send_raw.call_args_list]
+    assert [(m["cmd_name"], m["cseq"]) for m in sent] == [
+        ("feature_list_req", 1),
+        ("light_list_req", 2),
+        ("status_update_req", 3),
+    ]
+    # The block was reserved, the next command won't reuse any of the numbers
+    assert auth_instance.reserve_cseq() == 4
+
+
+@patch.object(ClientSession, "post", new_callable=AsyncMock)
+async def test_consecutive_commands_get_consecutive_cseq(mock_post, auth_instance):
+    api = CameDomoticAPI(auth_instance)
+    mock_post.side_effect = lambda *args, **kwargs: mock_json_response(
+        {**_SERVER_INFO_PAYLOAD, "array": [], "result": []}
+    )
+    light = Light({"act_id": 1, "status": 0, "type": "STEP_STEP"}, auth_instance)
+
+    # The commands go through the real Auth.async_send_raw
+    await api.async_get_lights()
+    await api.async_get_updates()
+    await light.async_set_status(LightStatus.ON)
+    await api.async_refresh_all()
+
+    sent = [
+        json.loads(parse_qs(c.kwargs["data"].decode())["command"][0])
+        for c in mock_post.call_args_list
+    ]
+    assert [m["sl_appl_msg"]["cseq"] for m in sent] == [1, 2, 3, 4, 5, 6]
+    assert auth_instance.cseq == 6
+
+
+async def test_async_set_lights_status(auth_instance):
+    api = CameDomoticAPI(auth_instance)
+    on_off = Light({"act_id": 1, "status": 0, "type": "STEP_STEP"}, auth_instance)
+    dimmer = Light(
+        {"act_id": 2, "status": 0, "type": "DIMMER", "perc": 10}, auth_instance
+    )
+
+    with patch.object(Auth, "async_send_raw", new_callable=AsyncMock) as mock_send_raw:
+        await api.async_set_lights_status([on_off, dimmer], LightStatus.ON, 150)
+
+    # The commands share the client ID, and each got its own sequence number
+    sent = [json.loads(c.args[0]) for c in mock_send_raw.call_args_list]
+    assert {m["sl_client_id"] for m in sent} == {auth_instance.client_id}
+    assert [m["sl_appl_msg"] for m in sent] == [
+        {
+            "act_id": 1,
+            "client": auth_instance.client_id,
+            "cmd_name": "light_switch_req",
+            "cseq": 1,
+            "wanted_status": 1,
+        },
+        {
+            "act_id": 2,
+            "client": auth_instance.client_id,
+            "cmd_name": "light_switch_req",
+            "cseq": 2,
+            "wanted_status": 1,
+            "perc": 100,
+        },
+    ]
+    assert on_off.status == LightStatus.ON and on_off.perc == 100
+    assert dimmer.status == LightStatus.ON and dimmer.perc == 100
+
+
+async def test_async_set_lights_status_partial_failure(auth_instance):
+    api = CameDomoticAPI(auth_instance)
+    lights = [
+        Light({"act_id": act_id, "status": 0, "type": "STEP_STEP"}, auth_instance)
+        for act_id in (1, 2, 3)
+    ]
+
+    async def send_raw_side_effect(command):
+        if json.loads(command)["sl_appl_msg"]["act_id"] == 2:
+            raise CameDomoticServerError("Bad ack code (3)")
+
+    with patch.object(
+        Auth, "async_send_raw", side_effect=send_raw_side_effect
+    ) as mock_send_raw:
+        with pytest.raises(CameDomoticServerError, match="1 of 3 lights") as exc_info:
+            await api.async_set_lights_status(lights, LightStatus.ON)
+
+    # The failure is reported, but the other commands are sent all the same
+    assert mock_send_raw.call_count == 3
+    assert "Bad ack code (3)" in str(exc_info.value)
+    assert isinstance(exc_info.value.__cause__, CameDomoticServerError)
+    assert [light.status for light in lights] == [
+        LightStatus.ON,
+        LightStatus.OFF,
+        LightStatus.ON,
+    ]
+
+
+async def test_async_set_lights_status_no_lights(auth_instance):
+    api = CameDomoticAPI(auth_instance)
+    with patch.object(Auth, "async_send_raw", new_callable=AsyncMock) as mock_send_raw:
+        await api.async_set_lights_status([], LightStatus.OFF)
+    mock_send_raw.assert_not_called()
+
+
+async def test_async_get_all(auth_instance):
     api = CameDomoticAPI(auth_instance)
-    mock_send_command.return_value.json.return_value = {
+
+    async def send_raw_side_effect(command):
+        payload = json.loads(command)
+        if payload["sl_cmd"] == "sl_users_list_req":
+            return {"sl_users_list": [{"name": "admin"}], "sl_data_ack_reason": 0}
+        if payload["sl_appl_msg"]["cmd_name"] == "light_list_req":
+            raise CameDomoticServerError("Bad ack code (3)")
+        return {"result": [], "sl_data_ack_reason": 0}
+
+    with patch.object(
+        Auth, "async_send_raw", side_effect=send_raw_side_effect
+    ) as mock_send_raw:
+        results = await api.async_get_all(include=("users", "lights", "updates"))
+
+    assert list(results) == ["users", "lights", "updates"]
+    assert [user.name for user in results["users"]] == ["admin"]
+    # A failing request doesn't prevent the others from completing
+    assert isinstance(results["lights"], CameDomoticServerError)
+    assert isinstance(results["updates"], UpdateList)
+    assert mock_send_raw.call_count == 3
+
+
+async def test_async_get_all_unknown_include(auth_instance):
+    api = CameDomoticAPI(auth_instance)
+
+    with patch.object(Auth, "async_send_raw") as mock_send_raw:
+        with pytest.raises(ValueError, match="floors"):
+            await api.async_get_all(include=("lights", "floors"))
+
+    mock_send_raw.assert_not_called()
+
+
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
+async def test_async_get_server_info_cached(mock_send_raw, auth_instance):
+    api = CameDomoticAPI(auth_instance, cache_ttl_sec=3600)
+    mock_send_raw.return_value = {
+        "keycode": "0000FFFF9999AAAA",
+        "swver": "1.2.3",
+        "type": "0",
+        "board": "3",
+        "serial": "0011ffee",
+        "list": ["lights"],
+        "sl_data_ack_reason": 0,
+    }
+
+    server_info = await api.async_get_server_info()
+    assert await api.async_get_server_info() is server_info
+    mock_send_raw.assert_called_once()
+
+    # Once invalidated, the server is queried again
+    api.invalidate_cache("server_info")
+    assert await api.async_get_server_info() is not server_info
+    assert mock_send_raw.call_count == 2
+
+
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
+async def test_async_get_users_cache_expiration(mock_send_raw, auth_instance):
+    api = CameDomoticAPI(auth_instance, cache_ttl_sec=3600)
+    mock_send_raw.return_value = {
+        "sl_users_list": [{"name": "admin"}],
+        "sl_data_ack_reason": 0,
+    }
+    loop = asyncio.get_running_loop()
+
+    with patch.object(loop, "time", return_value=1000.0):
+        users = await api.async_get_users()
+        users.clear()  # Callers get a copy of the cached list
+        assert len(await api.async_get_users()) == 1
+    mock_send_raw.assert_called_once()
+
+    with patch.object(loop, "time", return_value=1000.0 + 3600):
+        await api.async_get_users()
+    assert mock_send_raw.call_count == 2
+
+
+async def test_async_get_users_not_copied_without_cache(auth_instance):
+    api = CameDomoticAPI(auth_instance)
+    users = [User({"name": "admin"}, auth_instance)]
+
+    with patch.object(
+        CameDomoticAPI, "_async_get_users", new_callable=AsyncMock, return_value=users
+    ):
+        # Nothing is cached, so the fresh list is handed over as it is
+        assert await api.async_get_users() is users
+
+
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
+async def test_async_get_server_info_not_cached_by_default(
+    mock_send_raw, auth_instance
+):
+    api = CameDomoticAPI(auth_instance)
+    mock_send_raw.return_value = _SERVER_INFO_PAYLOAD
+
+    await api.async_get_server_info()
+    await api.async_get_server_info()
+
+    assert mock_send_raw.call_count == 2
+    assert not api._cache
+
+
+async def test_async_get_all_fills_cache(auth_instance):
+    api = CameDomoticAPI(auth_instance, cache_ttl_sec=3600)
+
+    async def send_raw_side_effect(command):
+        payload = json.loads(command)
+        if payload["sl_cmd"] == "sl_users_list_req":
+            return _USERS_PAYLOAD
+        return _SERVER_INFO_PAYLOAD
+
+    with patch.object(
+        Auth, "async_send_raw", side_effect=send_raw_side_effect
+    ) as mock_send_raw:
+        results = await api.async_get_all(include=("users", "server_info"))
+        # Served from the cache filled by async_get_all
+        assert await api.async_get_server_info() is results["server_info"]
+        assert [user.name for user in await api.async_get_users()] == [
+            "admin",
+            "user",
+        ]
+
+    assert mock_send_raw.call_count == 2
+
+
+async def test_invalidate_cache(auth_instance):
+    api = CameDomoticAPI(auth_instance)
+    api._cache.update({"users": (0, []), "server_info": (0, None)})
+
+    api.invalidate_cache("users")
+    assert list(api._cache) == ["server_info"]
+
+    api.invalidate_cache()
+    assert not api._cache
+
+
+@pytest.mark.parametrize("response", [{}, {"array": None}])
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
+async def test_async_get_lights_no_lights(mock_send_raw, response, auth_instance):
+    api = CameDomoticAPI(auth_instance)
+    mock_send_raw.return_value = {"sl_data_ack_reason": 0, **response}
+
+    assert await api.async_get_lights() == []
+
+
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
+async def test_async_iter_lights(mock_send_raw, auth_instance):
+    api = CameDomoticAPI(auth_instance)
+    mock_send_raw.return_value = {
         "array": [
-            {
-                "act_id": 1,
-                "floor_ind": 19,
-                "name": "light_ChQQs",
-                "room_ind": 23,
-                "status": 1,
-                "type": "STEP_STEP",
-            },
-            {
-                "act_id": 2,
-                "floor_ind": 19,
-                "name": "light_vdAEA",
-                "room_ind": 23,
-                "status": 1,
-                "type": "STEP_STEP",
-            },
-            {
-                "act_id": 3,
-                "floor_ind": 19,
-                "name": "light_onbFB",
-                "room_ind": 23,
-                "status": 0,
-                "type": "STEP_STEP",
-            },
-            {
-                "act_id": 4,
-                "floor_ind": 19,
-                "name": "light_xoOyy",
-                "perc": 52,
-                "room_ind": 23,
-                "status": 0,
-                "type": "DIMMER",
-            },
-            {
-                "act_id": 5,
-                "floor_ind": 19,
-                "name": "light_epChT",
-                "room_ind": 23,
-                "status": 0,
-                "type": "STEP_STEP",
-            },
-            {
-                "act_id": 6,
-                "floor_ind": 19,
-                "name": "light_DVyyO",
-                "room_ind": 23,
-                "status": 0,
-                "type": "STEP_STEP",
-            },
-            {
-                "act_id": 7,
-                "floor_ind": 19,
-                "name": "light_XeXgB",
-                "perc": 14,
-                "room_ind": 29,
-                "status": 0,
-                "type": "DIMMER",
-            },
+            {"act_id": 1, "name": "Kitchen", "type": "STEP_STEP"},
+            {"act_id": 2, "name": "Bedroom", "type": "DIMMER"},
         ],
-        "cmd_name": "light_list_resp",
-        "cseq": 1,
         "sl_data_ack_reason": 0,
     }
 
-    lights = await api.async_get_lights()
-    assert len(lights) == 7
-    assert isinstance(lights[0], Light)
-    assert isinstance(lights[1], Light)
+    lights = [light async for light in api.async_iter_lights()]
+
+    assert [light.act_id for light in lights] == [1, 2]
+    assert all(isinstance(light, Light) for light in lights)
+    assert json.loads(mock_send_raw.call_args.args[0])["sl_appl_msg"] == {
+        "client": "test_client_id",
+        "cmd_name": "light_list_req",
+        "cseq": 1,
+        "topologic_scope": "plant",
+        "value": 0,
+    }
+
+
+@patch.object(Light, "__init__", return_value=None)
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
+async def test_async_iter_lights_is_lazy(mock_send_raw, mock_light_init, auth_instance):
+    api = CameDomoticAPI(auth_instance)
+    mock_send_raw.return_value = {"array": [{"act_id": 1}, {"act_id": 2}]}
+
+    async for _ in api.async_iter_lights():
+        break
+
+    # Only the light reached by the iteration was built
+    mock_light_init.assert_called_once_with({"act_id": 1}, auth_instance)
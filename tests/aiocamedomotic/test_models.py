@@ -18,12 +18,16 @@
 # pylint: disable=protected-access
 
 
+import json
+import weakref
+from collections import OrderedDict
 from typing import AsyncGenerator
 from unittest.mock import AsyncMock, patch
 from aiohttp import ClientSession
 import pytest
 import pytest_asyncio
 from aiocamedomotic import Auth
+from aiocamedomotic.const import EntityValidator
 from aiocamedomotic.models import (
     ServerInfo,
     User,
@@ -37,12 +41,18 @@ from tests.aiocamedomotic.mocked_responses import STATUS_UPDATE_RESP
 
 
 @pytest_asyncio.fixture
-async def auth_instance() -> AsyncGenerator[Auth, None]:
-    session = ClientSession()
-    with patch.object(Auth, "async_validate_host", return_value=True):
-        auth = await Auth.async_create(session, "192.168.x.x", "user", "password")
+async def auth_instance(
+    shared_http_session: ClientSession,
+) -> AsyncGenerator[Auth, None]:
+    auth = await Auth.async_create(
+        shared_http_session,
+        "192.168.x.x",
+        "user",
+        "password",
+        close_websession_on_disposal=False,
+        validate_host=False,
+    )
     yield auth
-    await session.close()
 
 
 # region CameFeature and ServerInfo tests
@@ -65,6 +75,7 @@ def test_came_server_info_initialization():
     assert server_info.board == "board1"
     assert server_info.serial == "serial1"
     assert server_info.list == features
+    assert weakref.ref(server_info)() is server_info
 
 
 def test_came_server_info_initialization_nullable():
@@ -101,6 +112,7 @@ def test_came_user_initialization(auth_instance):
     assert user.auth == auth_instance
     assert user.raw_data == raw_data
     assert user.name == "Test User"
+    assert weakref.ref(user)() is user
 
 
 def test_came_user_invalid_input(auth_instance):
@@ -115,6 +127,18 @@ def test_came_user_invalid_input(auth_instance):
         User(raw_data, auth_instance)
 
 
+def test_entity_validator():
+    validator = EntityValidator.get_validator()
+    assert validator is EntityValidator.get_validator()
+
+    validator.validate_data({"a": 1, "b": 2}, ("a", "b"))
+    validator.validate_data(OrderedDict(a=1), ("a",))
+    with pytest.raises(ValueError, match="must be a dictionary"):
+        validator.validate_data([("a", 1)], ("a",))
+    with pytest.raises(ValueError, match="missing required keys: b, c"):
+        validator.validate_data({"a": 1}, ("a", "b", "c"))
+
+
 # endregion
 # region sLight tests
 
@@ -148,6 +172,8 @@ def test_updatelist_init_with_data():
     updates = UpdateList(STATUS_UPDATE_RESP)
     assert updates._raw_data == STATUS_UPDATE_RESP
     assert updates.data == STATUS_UPDATE_RESP.get("result")
+    # The list of the response is wrapped, not copied
+    assert updates.data is STATUS_UPDATE_RESP["result"]
 
 
 def test_updatelist_init_without_data():
@@ -168,10 +194,24 @@ def test_updatelist_init_with_non_dict_data():
     assert updates.data == []
 
 
+def test_updatelist_sequence_protocol():
+    result = STATUS_UPDATE_RESP["result"]
+    updates = UpdateList(STATUS_UPDATE_RESP)
+
+    assert len(updates) == len(result)
+    assert list(updates) == result
+    assert updates[0] is result[0]
+    assert result[0] in updates
+    assert updates.data is result
+    assert updates == UpdateList(STATUS_UPDATE_RESP)
+    assert not UpdateList()
+
+
 def test_came_light_initialization(light_data_on_off, auth_instance):
     light = Light(light_data_on_off, auth_instance)
     assert light.raw_data == light_data_on_off
     assert light.auth == auth_instance
+    assert weakref.ref(light)() is light
 
 
 def test_came_light_properties(light_data_dimmable, auth_instance):
@@ -192,7 +232,7 @@ def test_came_light_properties(light_data_dimmable, auth_instance):
     new_callable=AsyncMock,
     return_value="my_session_id",
 )
-@patch.object(Auth, "async_send_command", new_callable=AsyncMock)
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
 async def test_came_light_async_set_status(
     mock_send_command,
     mock_get_client_id,  # pylint: disable=unused-argument
@@ -209,16 +249,37 @@ async def test_came_light_async_set_status(
     assert light.status == LightStatus.ON
     assert light.perc == 100
 
-    # Test dimmable light
+    assert json.loads(mock_send_command.call_args.args[0]) == {
+        "sl_appl_msg": {
+            "act_id": light_data_on_off["act_id"],
+            "client": "my_session_id",
+            "cmd_name": "light_switch_req",
+            "cseq": 1,
+            "wanted_status": 1,
+        },
+        "sl_appl_msg_type": "domo",
+        "sl_client_id": "my_session_id",
+        "sl_cmd": "sl_data_req",
+    }
+
+    # Test dimmable light (the first command already reserved its cseq)
     await light_dimm.async_set_status(LightStatus.OFF, 50)
     assert mock_send_command.call_count == 2
+    assert json.loads(mock_send_command.call_args.args[0])["sl_appl_msg"] == {
+        "act_id": light_data_dimmable["act_id"],
+        "client": "my_session_id",
+        "cmd_name": "light_switch_req",
+        "cseq": 2,
+        "wanted_status": 0,
+        "perc": 50,
+    }
     assert light_dimm.status == LightStatus.OFF
     assert light_dimm.perc == 50
 
 
 @pytest.mark.asyncio
 @patch.object(Auth, "async_get_valid_client_id", return_value=1)
-@patch.object(Auth, "async_send_command", new_callable=AsyncMock)
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
 async def test_came_light_async_set_status_invalid_brightness(
     mock_send_command,
     mock_get_client_id,  # pylint: disable=unused-argument
@@ -244,4 +305,92 @@ async def test_came_light_async_set_status_invalid_brightness(
     assert light_dimm.perc == 0  # brightness is capped at 0
 
 
+@pytest.mark.asyncio
+@patch.object(Auth, "async_get_valid_client_id", return_value="my_session_id")
+@patch.object(Auth, "async_send_raw", new_callable=AsyncMock)
+async def test_came_light_async_set_status_skip_if_unchanged(
+    mock_send_command,
+    mock_get_client_id,  # pylint: disable=unused-argument
+    light_data_dimmable,
+    auth_instance,
+):
+    light = Light(light_data_dimmable, auth_instance)  # ON, 80%
+
+    await light.async_set_status(LightStatus.ON, skip_if_unchanged=True)
+    await light.async_set_status(LightStatus.ON, 80, skip_if_unchanged=True)
+    mock_send_command.assert_not_called()
+
+    await light.async_set_status(LightStatus.ON, 50, skip_if_unchanged=True)
+    await light.async_set_status(LightStatus.OFF, skip_if_unchanged=True)
+    assert mock_send_command.call_count == 2
+
+    # Without the flag, the command is always sent
+    await light.async_set_status(LightStatus.OFF)
+    assert mock_send_command.call_count == 3
+
+
+def test_light_enums_are_plain_values():
+    assert LightStatus.ON == 1
+    assert LightType.DIMMER == "DIMMER"
+    assert json.dumps([LightStatus.OFF, LightType.STEP_STEP]) == '[0, "STEP_STEP"]'
+
+
+def test_entities_have_no_instance_dict(light_data_on_off, auth_instance):
+    entities = [
+        Light(light_data_on_off, auth_instance),
+        User({"name": "admin"}, auth_instance),
+        ServerInfo(keycode="0000FFFF9999AAAA", serial="0011ffee", list=["lights"]),
+    ]
+    for entity in entities:
+        assert not hasattr(entity, "__dict__")
+
+
+def test_came_light_identity_attributes(auth_instance):
+    light = Light({"act_id": 7, "name": "Kitchen"}, auth_instance)
+    assert light.act_id == 7
+    assert light.name == "Kitchen"
+    # Attributes not provided by the server are still reported as missing
+    with pytest.raises(KeyError):
+        _ = light.floor_ind
+    with pytest.raises(KeyError):
+        _ = light.room_ind
+
+
+def test_came_light_from_raw_list(
+    light_data_on_off, light_data_dimmable, auth_instance
+):
+    items = [light_data_on_off, light_data_dimmable]
+    lights = Light.from_raw_list(items, auth_instance)
+
+    assert lights == [Light(item, auth_instance) for item in items]
+    assert lights[1].raw_data is light_data_dimmable
+    assert lights[1].auth is auth_instance
+    assert lights[1].act_id == light_data_dimmable["act_id"]
+    assert lights[1].type == LightType.DIMMER
+    assert Light.from_raw_list([], auth_instance) == []
+
+    with pytest.raises(ValueError):
+        Light.from_raw_list([light_data_on_off, {"name": "No ID"}], auth_instance)
+
+
+def test_came_light_enum_lookups(auth_instance):
+    light = Light(
+        {"act_id": 1, "status": 0, "type": "DIMMER"},
+        auth_instance,
+    )
+    assert light.status is LightStatus.OFF
+    assert light.type is LightType.DIMMER
+
+    light.raw_data["status"] = 1
+    assert light.status is LightStatus.ON
+
+    light.raw_data["status"] = 5
+    with pytest.raises(ValueError):
+        _ = light.status
+
+    light = Light({"act_id": 1, "type": "UNKNOWN"}, auth_instance)
+    with pytest.raises(ValueError):
+        _ = light.type
+
+
 # endregion
@@ -0,0 +1,55 @@
+# Copyright 2024 - GitHub user: fredericks1982
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+
+import asyncio
+from typing import AsyncGenerator
+
+import aiohttp
+import pytest
+from pytest_asyncio import is_async_test
+
+
+def pytest_collection_modifyitems(items):
+    # Run all the async tests in the session event loop, so that they can use the
+    # resources of the session-scoped fixtures (e.g. the shared aiohttp session).
+    # The async fixtures run there too, see asyncio_default_fixture_loop_scope.
+    session_scope_marker = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_scope_marker, append=False)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    # Run the tests on uvloop where it is installed (it is not available on
+    # Windows), falling back to the default asyncio loop otherwise
+    try:
+        import uvloop  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+async def shared_http_session() -> AsyncGenerator[aiohttp.ClientSession, None]:
+    # One aiohttp session (and connection pool) for the whole test session. The
+    # fixtures using it must not close it, see close_websession_on_disposal.
+    # The requests of the tests are mocked, so a single pooled connection is enough.
+    connector = aiohttp.TCPConnector(limit=1, limit_per_host=1)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        yield session
+        assert not session.closed, "the shared aiohttp session was closed by a test"